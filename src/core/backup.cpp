@@ -2,7 +2,13 @@
 #include "core/file_utils.h"
 #include "metadata/metadata.h"
 #include "metadata/filesystem.h"
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <deque>
 #include <iostream>
+#include <mutex>
+#include <thread>
 
 namespace backuprestore {
 
@@ -19,34 +25,148 @@ bool Backup::execute(const std::filesystem::path& source_root,
     backup_count_ = 0;
     skipped_count_ = 0;
 
-    // 获取所有文件
-    std::vector<std::filesystem::path> files;
-    FileUtils::getFilesRecursive(source_root, files);
+    // 空过滤器提前置空：热循环里不再为每个文件走一次必然通过的虚调用
+    if (filter && filter->empty()) {
+        filter = nullptr;
+    }
 
-    std::cout << "找到 " << files.size() << " 个文件" << std::endl;
+    // 增量备份：先把已有索引装进内存，未变化的文件（mode/mtime 与上次
+    // 一致且数据文件仍在）直接跳过整个拷贝
+    if (!repo_->loadIndex()) {
+        std::cerr << "加载已有索引失败，按全量备份处理" << std::endl;
+    }
 
-    // 备份每个文件
-    for (const auto& file_path : files) {
-        // 应用过滤器
-        if (filter && !filter->shouldInclude(file_path)) {
-            skipped_count_++;
-            continue;
-        }
+    // 单遍流水：遍历线程边走边过筛，经有界队列把任务喂给工作线程。
+    // 第一个文件不必等全树枚举完就开始备份，整树路径也不再驻留内存
+    // 相对路径按前缀切字符串：遍历产出的绝对路径都带 source_root 前缀。
+    // 不走 std::filesystem::relative——它会逐级规范化（还会解析符号链接，
+    // 导致链接按其目标的名字入库）
+    const std::string& baseNative = source_root.native();
+    std::size_t basePrefixLen = baseNative.size();
+    if (!baseNative.empty() &&
+        baseNative.back() != std::filesystem::path::preferred_separator) {
+        ++basePrefixLen;
+    }
 
-        // 检查文件类型是否支持
-        auto file_type = FilesystemUtils::getFileType(file_path);
-        if (!FilesystemUtils::isBackupSupported(file_type)) {
-            skipped_count_++;
-            continue;
+    constexpr std::size_t kQueueCap = 1024;
+    struct Task {
+        std::filesystem::path path;
+        std::filesystem::path rel;
+        struct stat st;
+    };
+    std::deque<Task> queue;
+    std::mutex qm;
+    std::condition_variable cvSpace, cvItems;
+    bool producing = true;
+
+    std::size_t found = 0;      // 仅遍历线程写
+    std::size_t preSkipped = 0; // 仅遍历线程写
+    std::atomic<std::size_t> done{0};
+    std::atomic<std::size_t> failed{0};
+
+    // 遍历不跟随目录符号链接（迭代器默认行为，天然防环），
+    // 无权限的子目录跳过而不是让整个遍历抛异常中止
+    auto producer = [&]() {
+        // skip_permission_denied 只挡 EACCES，迭代器推进仍可能抛
+        // filesystem_error（目录在遍历中被删等）；这里跑在独立线程上，
+        // 异常逃逸会直接 terminate，必须在线程内兜住，
+        // 并保证无论如何都走到清 producing 的收尾
+        try {
+            std::error_code ec;
+            std::filesystem::recursive_directory_iterator it(
+                source_root,
+                std::filesystem::directory_options::skip_permission_denied, ec);
+            if (!ec) {
+                for (const auto& entry : it) {
+                    auto status = entry.symlink_status(ec);
+                    if (ec) {
+                        ec.clear();
+                        continue;
+                    }
+                    if (!std::filesystem::is_regular_file(status) &&
+                        !std::filesystem::is_symlink(status)) {
+                        continue;
+                    }
+                    ++found;
+
+                    const auto& file_path = entry.path();
+
+                    // 应用过滤器（native() 是现成字符串，链上过滤器全部复用）
+                    if (filter && !filter->shouldInclude(file_path.native())) {
+                        ++preSkipped;
+                        continue;
+                    }
+
+                    // 检查文件类型是否支持（类型判定的 lstat 结果交还并随任务下传，
+                    // 消费端读元数据时直接复用，同一 inode 只 stat 一次）
+                    struct stat st{};
+                    auto file_type = FilesystemUtils::getFileType(file_path.native(), st);
+                    if (!FilesystemUtils::isBackupSupported(file_type)) {
+                        ++preSkipped;
+                        continue;
+                    }
+
+                    std::filesystem::path rel(file_path.native().substr(basePrefixLen));
+
+                    std::unique_lock<std::mutex> lk(qm);
+                    cvSpace.wait(lk, [&] { return queue.size() < kQueueCap; });
+                    queue.push_back(Task{file_path, std::move(rel), st});
+                    lk.unlock();
+                    cvItems.notify_one();
+                }
+            }
+        } catch (const std::exception& e) {
+            std::cerr << "遍历源目录中止: " << e.what() << std::endl;
         }
-
-        if (backupFile(file_path, source_root)) {
-            backup_count_++;
-        } else {
-            skipped_count_++;
+        {
+            std::lock_guard<std::mutex> lk(qm);
+            producing = false;
+        }
+        cvItems.notify_all();
+    };
+
+    // 备份每个文件：单文件开销以系统调用为主（stat/open/copy/chmod），
+    // 用小型线程池并发消费队列
+    auto consumer = [&]() {
+        for (;;) {
+            Task t;
+            {
+                std::unique_lock<std::mutex> lk(qm);
+                cvItems.wait(lk, [&] { return !queue.empty() || !producing; });
+                if (queue.empty()) return;
+                t = std::move(queue.front());
+                queue.pop_front();
+            }
+            cvSpace.notify_one();
+
+            if (backupFile(t.path, t.rel, t.st)) {
+                done.fetch_add(1);
+            } else {
+                failed.fetch_add(1);
+            }
         }
+    };
+
+    unsigned workers = std::thread::hardware_concurrency();
+    if (workers == 0) workers = 1;
+    workers = std::min<unsigned>(workers, 8u);
+
+    std::thread walker(producer);
+    std::vector<std::thread> pool;
+    pool.reserve(workers);
+    for (unsigned t = 0; t < workers; ++t) {
+        pool.emplace_back(consumer);
+    }
+    walker.join();
+    for (auto& th : pool) {
+        th.join();
     }
 
+    std::cout << "找到 " << found << " 个文件" << std::endl;
+
+    backup_count_ += done.load();
+    skipped_count_ += preSkipped + failed.load();
+
     // 保存索引
     if (!repo_->saveIndex()) {
         std::cerr << "保存索引失败" << std::endl;
@@ -60,14 +180,17 @@ bool Backup::execute(const std::filesystem::path& source_root,
 }
 
 bool Backup::backupFile(const std::filesystem::path& source_path,
-                        const std::filesystem::path& source_root) {
+                        const std::filesystem::path& relative_path,
+                        const struct stat& st) {
     try {
-        // 计算相对路径
-        auto relative_path = FileUtils::getRelativePath(source_root, source_path);
-        
-        // 读取元数据
+        // 未变化的文件直接复用仓库里的副本
+        if (repo_->isUpToDate(relative_path, st)) {
+            return true;
+        }
+
+        // 读取元数据（复用遍历时的 lstat 结果）
         Metadata metadata;
-        if (!metadata.loadFromFile(source_path)) {
+        if (!metadata.loadFromStat(source_path, st)) {
             std::cerr << "读取元数据失败: " << source_path << std::endl;
             return false;
         }
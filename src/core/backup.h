@@ -1,6 +1,7 @@
 #pragma once
 
 #include <filesystem>
+#include <sys/stat.h>
 #include <string>
 #include <memory>
 #include "core/repository.h"
@@ -46,9 +47,12 @@ private:
 
     /**
      * @brief 备份单个文件
+     * @param relative_path 遍历阶段按前缀切好的仓库内相对路径
+     * @param st 遍历阶段已取得的 lstat 结果，元数据直接复用
      */
     bool backupFile(const std::filesystem::path& source_path,
-                    const std::filesystem::path& source_root);
+                    const std::filesystem::path& relative_path,
+                    const struct stat& st);
 };
 
 } // namespace backuprestore
@@ -3,8 +3,53 @@
 #include <iostream>
 #include <cstdint>
 
+#ifdef __linux__
+#include <fcntl.h>
+#include <sys/sendfile.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
 namespace backuprestore {
 
+#ifdef __linux__
+// 内核态拷贝：sendfile 在页缓存之间直接搬运，数据不经过用户态缓冲区
+static bool sendfileCopy(const std::filesystem::path& from,
+                         const std::filesystem::path& to) {
+    int sfd = ::open(from.c_str(), O_RDONLY);
+    if (sfd < 0) {
+        return false;
+    }
+
+    struct stat st{};
+    if (fstat(sfd, &st) != 0 || !S_ISREG(st.st_mode)) {
+        ::close(sfd);
+        return false;
+    }
+
+    int dfd = ::open(to.c_str(), O_WRONLY | O_CREAT | O_TRUNC, 0644);
+    if (dfd < 0) {
+        ::close(sfd);
+        return false;
+    }
+
+    bool ok = true;
+    off_t remaining = st.st_size;
+    while (remaining > 0) {
+        ssize_t sent = ::sendfile(dfd, sfd, nullptr, static_cast<size_t>(remaining));
+        if (sent <= 0) {
+            ok = false;
+            break;
+        }
+        remaining -= sent;
+    }
+
+    ::close(sfd);
+    ::close(dfd);
+    return ok;
+}
+#endif
+
 void FileUtils::getFilesRecursive(const std::filesystem::path& root, 
                                    std::vector<std::filesystem::path>& files) {
     if (!std::filesystem::exists(root)) {
@@ -12,7 +57,11 @@ void FileUtils::getFilesRecursive(const std::filesystem::path& root,
     }
 
     for (const auto& entry : std::filesystem::recursive_directory_iterator(root)) {
-        if (entry.is_regular_file() || entry.is_symlink()) {
+        // 只取一次 symlink_status：优先用目录项缓存的类型信息（d_type），
+        // 避免 is_regular_file() + is_symlink() 各自触发一次 stat
+        auto status = entry.symlink_status();
+        if (std::filesystem::is_regular_file(status) ||
+            std::filesystem::is_symlink(status)) {
             files.push_back(entry.path());
         }
     }
@@ -38,15 +87,21 @@ bool FileUtils::copyFile(const std::filesystem::path& from,
         }
 
         if (std::filesystem::is_symlink(from)) {
-            // 处理符号链接
+            // 处理符号链接：直接 remove（不存在时静默返回 false），
+            // 省掉先 exists 再 remove 的一次 stat
             auto target = std::filesystem::read_symlink(from);
-            if (std::filesystem::exists(to)) {
-                std::filesystem::remove(to);
-            }
+            std::error_code ec;
+            std::filesystem::remove(to, ec);
             std::filesystem::create_symlink(target, to);
         } else {
+#ifdef __linux__
+            // 优先走内核态拷贝，失败（跨文件系统等）再退回用户态拷贝
+            if (sendfileCopy(from, to)) {
+                return true;
+            }
+#endif
             // 复制普通文件
-            std::filesystem::copy_file(from, to, 
+            std::filesystem::copy_file(from, to,
                 std::filesystem::copy_options::overwrite_existing);
         }
         return true;
@@ -2,7 +2,7 @@
 #include "core/file_utils.h"
 #include <fstream>
 #include <iostream>
-#include <sstream>
+#include <string_view>
 
 namespace backuprestore {
 
@@ -40,8 +40,11 @@ bool Repository::storeFile(const std::filesystem::path& source_path,
             return false;
         }
 
-        // 保存元数据到索引
-        index_[relative_path] = metadata;
+        // 保存元数据到索引（加锁：storeFile 可能被并行调用）
+        {
+            std::lock_guard<std::mutex> lock(index_mutex_);
+            index_[relative_path] = metadata;
+        }
 
         return true;
     } catch (const std::exception& e) {
@@ -55,11 +58,9 @@ bool Repository::restoreFile(const std::filesystem::path& relative_path,
                              Metadata& metadata) {
     try {
         auto storage_path = getStoragePath(relative_path);
-        
-        if (!std::filesystem::exists(storage_path)) {
-            std::cerr << "仓库中不存在文件: " << relative_path << std::endl;
-            return false;
-        }
+
+        // 不单独 stat 一次存在性：数据文件缺失时拷贝自己会失败并报错，
+        // 热路径上省掉每个文件一次系统调用
 
         // 从索引获取元数据
         auto it = index_.find(relative_path);
@@ -89,17 +90,25 @@ bool Repository::restoreFile(const std::filesystem::path& relative_path,
 
 bool Repository::saveIndex() {
     try {
-        std::ofstream ofs(index_file_);
+        std::ofstream ofs(index_file_, std::ios::binary);
         if (!ofs.is_open()) {
             std::cerr << "无法打开索引文件: " << index_file_ << std::endl;
             return false;
         }
 
+        // 先把所有行拼进一个缓冲区，最后一次写出，
+        // 避免每个条目都经过一次流插入
+        std::string buffer;
+        buffer.reserve(index_.size() * 64);
         for (const auto& [path, metadata] : index_) {
-            ofs << path.string() << "\t" << metadata.serialize() << "\n";
+            buffer += path.native(); // POSIX 上是现成字符串引用，不产生拷贝
+            buffer += '\t';
+            buffer += metadata.serialize();
+            buffer += '\n';
         }
+        ofs.write(buffer.data(), static_cast<std::streamsize>(buffer.size()));
 
-        return true;
+        return ofs.good();
     } catch (const std::exception& e) {
         std::cerr << "保存索引失败: " << e.what() << std::endl;
         return false;
@@ -107,34 +116,52 @@ bool Repository::saveIndex() {
 }
 
 bool Repository::loadIndex() {
+    // 已装载则幂等返回：多个消费方（备份、还原、校验）共享一次解析
+    if (index_loaded_) {
+        return true;
+    }
+
     try {
         if (!std::filesystem::exists(index_file_)) {
+            index_loaded_ = true;
             return true;  // 索引文件不存在，返回成功（空索引）
         }
 
-        std::ifstream ifs(index_file_);
+        std::ifstream ifs(index_file_, std::ios::binary);
         if (!ifs.is_open()) {
             std::cerr << "无法打开索引文件: " << index_file_ << std::endl;
             return false;
         }
 
+        // 整个索引一次读入内存，再按行切 string_view 解析，
+        // 避免 getline 逐行经过流层的开销
+        ifs.seekg(0, std::ios::end);
+        std::string content(static_cast<size_t>(ifs.tellg()), '\0');
+        ifs.seekg(0, std::ios::beg);
+        if (!content.empty()) {
+            ifs.read(content.data(), static_cast<std::streamsize>(content.size()));
+        }
+
         index_.clear();
-        std::string line;
-        while (std::getline(ifs, line)) {
+        size_t pos = 0;
+        while (pos < content.size()) {
+            size_t eol = content.find('\n', pos);
+            if (eol == std::string::npos) eol = content.size();
+            std::string_view line(content.data() + pos, eol - pos);
+            pos = eol + 1;
+
             if (line.empty()) continue;
 
             size_t tab_pos = line.find('\t');
-            if (tab_pos == std::string::npos) continue;
-
-            std::string path_str = line.substr(0, tab_pos);
-            std::string metadata_str = line.substr(tab_pos + 1);
+            if (tab_pos == std::string_view::npos) continue;
 
             Metadata metadata;
-            if (metadata.deserialize(metadata_str)) {
-                index_[path_str] = metadata;
+            if (metadata.deserialize(std::string(line.substr(tab_pos + 1)))) {
+                index_[std::string(line.substr(0, tab_pos))] = metadata;
             }
         }
 
+        index_loaded_ = true;
         return true;
     } catch (const std::exception& e) {
         std::cerr << "加载索引失败: " << e.what() << std::endl;
@@ -150,6 +177,29 @@ std::vector<std::filesystem::path> Repository::listFiles() const {
     return files;
 }
 
+bool Repository::isUpToDate(const std::filesystem::path& relative_path,
+                            const struct stat& st) const {
+    {
+        std::lock_guard<std::mutex> lock(index_mutex_);
+        auto it = index_.find(relative_path);
+        if (it == index_.end()) {
+            return false;
+        }
+
+        const Metadata& m = it->second;
+        // 符号链接的 mtime 不可靠（目标可能已变），不走跳过路径
+        if (m.is_symlink ||
+            m.mtime != st.st_mtime ||
+            m.mode != static_cast<std::uint32_t>(st.st_mode)) {
+            return false;
+        }
+    }
+
+    // 索引匹配还不够：数据文件可能被人手动删了
+    std::error_code ec;
+    return std::filesystem::exists(getStoragePath(relative_path), ec) && !ec;
+}
+
 bool Repository::getMetadata(const std::filesystem::path& relative_path, Metadata& metadata) const {
     auto it = index_.find(relative_path);
     if (it == index_.end()) {
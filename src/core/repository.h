@@ -3,6 +3,7 @@
 #include <string>
 #include <filesystem>
 #include <map>
+#include <mutex>
 #include <vector>
 #include "metadata/metadata.h"
 
@@ -70,6 +71,14 @@ public:
      */
     bool getMetadata(const std::filesystem::path& relative_path, Metadata& metadata) const;
 
+    /**
+     * @brief 判断仓库中已有的同名文件是否仍与源文件一致
+     * （按索引里的 mode/mtime 对比现成的 stat 结果，并确认数据文件还在），
+     * 一致时重复备份可以跳过整个拷贝
+     */
+    bool isUpToDate(const std::filesystem::path& relative_path,
+                    const struct stat& st) const;
+
 private:
     std::filesystem::path repo_path_;
     std::filesystem::path data_dir_;   // 数据目录
@@ -78,6 +87,13 @@ private:
     // 索引：相对路径 -> 元数据
     std::map<std::filesystem::path, Metadata> index_;
 
+    // 索引是否已装载：同一个 Repository 对象上重复 loadIndex 直接返回，
+    // 磁盘上的索引文件不会被重复解析
+    bool index_loaded_ = false;
+
+    // 保护 index_ 的并发写入（备份可能由多个工作线程并行调用 storeFile）
+    mutable std::mutex index_mutex_;
+
     /**
      * @brief 获取文件在仓库中的存储路径
      */
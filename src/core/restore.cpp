@@ -1,7 +1,10 @@
 #include "core/restore.h"
 #include "core/file_utils.h"
 #include "metadata/metadata.h"
+#include <algorithm>
+#include <atomic>
 #include <iostream>
+#include <thread>
 
 namespace backuprestore {
 
@@ -22,15 +25,44 @@ bool Restore::execute(const std::filesystem::path& target_root) {
     restore_count_ = 0;
     failed_count_ = 0;
 
-    // 还原每个文件
-    for (const auto& relative_path : files) {
-        if (restoreFile(relative_path, target_root)) {
-            restore_count_++;
-        } else {
-            failed_count_++;
+    // 还原每个文件：不同文件之间没有顺序依赖，单文件开销以系统调用为主，
+    // 用小型线程池并发处理，工作线程按原子游标领取任务
+    unsigned workers = std::thread::hardware_concurrency();
+    if (workers == 0) workers = 1;
+    workers = std::min<unsigned>({workers, 8u,
+                                  static_cast<unsigned>(files.size())});
+
+    std::atomic<std::size_t> next{0};
+    std::atomic<std::size_t> done{0};
+    std::atomic<std::size_t> failed{0};
+
+    auto work = [&]() {
+        std::size_t i;
+        while ((i = next.fetch_add(1)) < files.size()) {
+            if (restoreFile(files[i], target_root)) {
+                done.fetch_add(1);
+            } else {
+                failed.fetch_add(1);
+            }
+        }
+    };
+
+    if (workers <= 1) {
+        work();
+    } else {
+        std::vector<std::thread> pool;
+        pool.reserve(workers);
+        for (unsigned t = 0; t < workers; ++t) {
+            pool.emplace_back(work);
+        }
+        for (auto& th : pool) {
+            th.join();
         }
     }
 
+    restore_count_ = done.load();
+    failed_count_ = failed.load();
+
     std::cout << "还原完成: " << restore_count_ << " 个文件已还原, " 
               << failed_count_ << " 个文件失败" << std::endl;
 
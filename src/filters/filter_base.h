@@ -20,11 +20,26 @@ public:
      */
     virtual bool shouldInclude(const std::filesystem::path& path) const = 0;
 
+    /**
+     * @brief 字符串路径版本：调用方已有现成字符串时直接匹配，
+     * 免得链上每个过滤器各自再做一次 path->string 转换
+     */
+    virtual bool shouldInclude(const std::string& path_str) const {
+        return shouldInclude(std::filesystem::path(path_str));
+    }
+
+    /**
+     * @brief 过滤器是否不含任何规则
+     * 空过滤器对所有路径都返回包含，调用方可据此在热循环前整体跳过过滤
+     */
+    virtual bool empty() const { return false; }
+
     /**
      * @brief 过滤器类型
      */
     enum class Type {
         Path,           // 路径过滤器（已实现）
+        Chain,          // 过滤器链（组合多个过滤器）
         FileType,       // 文件类型过滤（预留）
         Name,           // 文件名过滤（预留）
         Time,           // 时间过滤（预留）
@@ -0,0 +1,39 @@
+#include "filters/filter_chain.h"
+
+namespace backuprestore {
+
+void FilterChain::addFilter(std::shared_ptr<FilterBase> filter) {
+    if (filter) {
+        filters_.push_back(std::move(filter));
+    }
+}
+
+void FilterChain::clear() {
+    filters_.clear();
+}
+
+bool FilterChain::empty() const {
+    for (const auto& filter : filters_) {
+        if (!filter->empty()) {
+            return false;
+        }
+    }
+    return true;
+}
+
+bool FilterChain::shouldInclude(const std::filesystem::path& path) const {
+    // 字符串只转换一次，链上所有过滤器复用
+    return shouldInclude(path.string());
+}
+
+bool FilterChain::shouldInclude(const std::string& path_str) const {
+    // 空链默认包含；非空链按顺序短路求值
+    for (const auto& filter : filters_) {
+        if (!filter->shouldInclude(path_str)) {
+            return false;
+        }
+    }
+    return true;
+}
+
+} // namespace backuprestore
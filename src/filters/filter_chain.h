@@ -0,0 +1,48 @@
+#pragma once
+
+#include "filters/filter_base.h"
+#include <memory>
+#include <vector>
+
+namespace backuprestore {
+
+/**
+ * @brief 过滤器链
+ * 将多个过滤器组合为"与"关系的复合过滤器。
+ * 链在添加时即摊平成一个扁平的指针数组，
+ * shouldInclude 只做一次顺序短路遍历，每个文件不再有额外的组合层开销。
+ */
+class FilterChain : public FilterBase {
+public:
+    FilterChain() = default;
+
+    /**
+     * @brief 批量构造：一次传入整条过滤器链
+     */
+    explicit FilterChain(std::vector<std::shared_ptr<FilterBase>> filters)
+        : filters_(std::move(filters)) {}
+
+    /**
+     * @brief 添加一个过滤器到链尾
+     */
+    void addFilter(std::shared_ptr<FilterBase> filter);
+
+    /**
+     * @brief 清除所有过滤器
+     */
+    void clear();
+
+    /**
+     * @brief 链中是否没有任何有效过滤器（全部成员为空也算空链）
+     */
+    bool empty() const override;
+
+    bool shouldInclude(const std::filesystem::path& path) const override;
+    bool shouldInclude(const std::string& path_str) const override;
+    Type getType() const override { return Type::Chain; }
+
+private:
+    std::vector<std::shared_ptr<FilterBase>> filters_;
+};
+
+} // namespace backuprestore
@@ -4,12 +4,31 @@
 
 namespace backuprestore {
 
+PathFilter::Pattern PathFilter::normalizePattern(const std::string& pattern) {
+    Pattern p;
+    if (!pattern.empty() && pattern.back() == '/') {
+        p.text = pattern.substr(0, pattern.length() - 1);
+        p.dir_prefix = true;
+    } else {
+        p.text = pattern;
+    }
+    return p;
+}
+
+PathFilter::PathFilter(const std::vector<std::string>& includes,
+                       const std::vector<std::string>& excludes) {
+    include_patterns_.reserve(includes.size());
+    for (const auto& p : includes) include_patterns_.push_back(normalizePattern(p));
+    exclude_patterns_.reserve(excludes.size());
+    for (const auto& p : excludes) exclude_patterns_.push_back(normalizePattern(p));
+}
+
 void PathFilter::addInclude(const std::string& pattern) {
-    include_patterns_.push_back(pattern);
+    include_patterns_.push_back(normalizePattern(pattern));
 }
 
 void PathFilter::addExclude(const std::string& pattern) {
-    exclude_patterns_.push_back(pattern);
+    exclude_patterns_.push_back(normalizePattern(pattern));
 }
 
 void PathFilter::clear() {
@@ -18,16 +37,19 @@ void PathFilter::clear() {
 }
 
 bool PathFilter::shouldInclude(const std::filesystem::path& path) const {
+    // 路径只转换一次字符串，匹配时全部复用
+    return shouldInclude(path.string());
+}
+
+bool PathFilter::shouldInclude(const std::string& path_str) const {
     // 如果没有任何规则，默认包含
     if (include_patterns_.empty() && exclude_patterns_.empty()) {
         return true;
     }
 
-    std::string path_str = path.string();
-
     // 先检查排除规则
     for (const auto& exclude : exclude_patterns_) {
-        if (matchesPattern(path, exclude)) {
+        if (matchesPattern(path_str, exclude)) {
             return false;
         }
     }
@@ -35,7 +57,7 @@ bool PathFilter::shouldInclude(const std::filesystem::path& path) const {
     // 如果有包含规则，检查是否匹配
     if (!include_patterns_.empty()) {
         for (const auto& include : include_patterns_) {
-            if (matchesPattern(path, include)) {
+            if (matchesPattern(path_str, include)) {
                 return true;
             }
         }
@@ -45,19 +67,15 @@ bool PathFilter::shouldInclude(const std::filesystem::path& path) const {
     return true;  // 没有排除规则且没有包含规则（或已通过排除检查）
 }
 
-bool PathFilter::matchesPattern(const std::filesystem::path& path, 
-                                const std::string& pattern) const {
-    std::string path_str = path.string();
-    
-    // 简单前缀匹配
-    if (pattern.back() == '/') {
+bool PathFilter::matchesPattern(const std::string& path_str,
+                                const Pattern& pattern) {
+    // 简单前缀匹配（模式已在添加时规范化，这里零分配）
+    if (pattern.dir_prefix) {
         // 目录模式：检查是否为该目录下的文件
-        std::string dir_pattern = pattern.substr(0, pattern.length() - 1);
-        return path_str.find(dir_pattern) == 0;
-    } else {
-        // 精确匹配或包含匹配
-        return path_str == pattern || path_str.find(pattern) != std::string::npos;
+        return path_str.compare(0, pattern.text.size(), pattern.text) == 0;
     }
+    // 精确匹配或包含匹配
+    return path_str.find(pattern.text) != std::string::npos;
 }
 
 } // namespace backuprestore
@@ -12,6 +12,14 @@ namespace backuprestore {
  */
 class PathFilter : public FilterBase {
 public:
+    PathFilter() = default;
+
+    /**
+     * @brief 批量构造：一次传入全部 include/exclude 模式
+     */
+    PathFilter(const std::vector<std::string>& includes,
+               const std::vector<std::string>& excludes);
+
     /**
      * @brief 添加包含路径
      */
@@ -28,18 +36,34 @@ public:
     void clear();
 
     bool shouldInclude(const std::filesystem::path& path) const override;
+    bool shouldInclude(const std::string& path_str) const override;
+    bool empty() const override {
+        return include_patterns_.empty() && exclude_patterns_.empty();
+    }
     Type getType() const override { return Type::Path; }
 
 private:
-    std::vector<std::string> include_patterns_;
-    std::vector<std::string> exclude_patterns_;
+    /**
+     * @brief 添加时即规范化的模式：
+     * 末尾 '/' 在入链时剥掉并记成目录前缀匹配，
+     * 匹配时不再做任何字符串切割
+     */
+    struct Pattern {
+        std::string text;        // 规范化后的模式文本
+        bool dir_prefix = false; // 原模式以 '/' 结尾：按目录前缀匹配
+    };
+
+    std::vector<Pattern> include_patterns_;
+    std::vector<Pattern> exclude_patterns_;
 
     /**
      * @brief 检查路径是否匹配模式（简单前缀匹配）
      * TODO: 支持更复杂的模式（glob/regex）
      */
-    bool matchesPattern(const std::filesystem::path& path, 
-                        const std::string& pattern) const;
+    static bool matchesPattern(const std::string& path_str,
+                               const Pattern& pattern);
+
+    static Pattern normalizePattern(const std::string& pattern);
 };
 
 } // namespace backuprestore
@@ -8,9 +8,42 @@
 #include "metadata/filesystem.h"
 #include <filesystem>
 #include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <mutex>
+#include <thread>
 
 namespace backuprestore {
 
+// 枚举源树：用目录项缓存的 symlink_status 一次拿到类型（d_type 命中时
+// 没有额外系统调用），无权限的子目录跳过而不是让整个遍历抛异常中止。
+// 类型在遍历时顺手记下，备份循环里不必对每个文件再 lstat 一次
+static void collectSourceFiles(const std::filesystem::path& root,
+                               std::vector<std::filesystem::path>& files,
+                               std::vector<FilesystemUtils::FileType>& types) {
+    std::error_code ec;
+    std::filesystem::recursive_directory_iterator it(
+        root, std::filesystem::directory_options::skip_permission_denied, ec);
+    if (ec) {
+        return;
+    }
+
+    for (const auto& entry : it) {
+        auto status = entry.symlink_status(ec);
+        if (ec) {
+            ec.clear();
+            continue;
+        }
+        if (std::filesystem::is_symlink(status)) {
+            files.push_back(entry.path());
+            types.push_back(FilesystemUtils::FileType::Symlink);
+        } else if (std::filesystem::is_regular_file(status)) {
+            files.push_back(entry.path());
+            types.push_back(FilesystemUtils::FileType::Regular);
+        }
+    }
+}
+
 bool GuiOperations::backupWithProgress(
     const std::filesystem::path& source_root,
     const std::filesystem::path& repo_path,
@@ -35,9 +68,10 @@ bool GuiOperations::backupWithProgress(
         return false;
     }
 
-    // 获取所有文件
+    // 获取所有文件（类型随遍历一并取得）
     std::vector<std::filesystem::path> files;
-    FileUtils::getFilesRecursive(source_root, files);
+    std::vector<FilesystemUtils::FileType> types;
+    collectSourceFiles(source_root, files, types);
 
     // 创建过滤器
     std::unique_ptr<PathFilter> filter;
@@ -52,82 +86,168 @@ bool GuiOperations::backupWithProgress(
         }
     }
 
+    // 空过滤器提前丢弃：循环里不再为每个文件走必然通过的匹配
+    if (filter && filter->empty()) {
+        filter.reset();
+    }
+
+    // 相对路径按前缀切字符串：遍历产出的绝对路径都带 source_root 前缀，
+    // 不必每个文件各跑一次 std::filesystem::relative（它还会解析符号链接）
+    const std::string& baseNative = source_root.native();
+    std::size_t basePrefixLen = baseNative.size();
+    if (!baseNative.empty() &&
+        baseNative.back() != std::filesystem::path::preferred_separator) {
+        ++basePrefixLen;
+    }
+
     // 通知开始
     if (callback) {
         callback->onStart(files.size(), "备份");
     }
 
-    std::size_t success_count = 0;
-    std::size_t failed_count = 0;
-    std::size_t skipped_count = 0;
-
-    // 处理每个文件
-    for (std::size_t i = 0; i < files.size(); ++i) {
-        const auto& file_path = files[i];
-
-        // 检查是否取消
-        if (callback && callback->shouldCancel()) {
-            if (callback) {
-                callback->onComplete(success_count, failed_count, skipped_count, false);
+    std::atomic<std::size_t> success_count{0};
+    std::atomic<std::size_t> failed_count{0};
+    std::atomic<std::size_t> skipped_count{0};
+    std::atomic<bool> cancelled{false};
+
+    // 回调实现方通常不保证线程安全（还要驱动 UI 控件），
+    // 所有回调调用统一经这把锁串行化
+    std::mutex cb_mutex;
+
+    // 进度上报与工作线程解耦：工作线程只推进计数器并记下当前文件，
+    // onProgress/shouldCancel 由协调线程周期性代为调用，
+    // 小文件风暴时工作线程不再被回调串行化
+    std::atomic<std::size_t> processed{0};
+    std::mutex current_mutex;
+    std::filesystem::path current_file;
+
+    // 循环不变量提出循环：总数与百分比系数整个过程不变，算一次即可
+    const std::size_t total = files.size();
+    const double pct_scale = total > 0 ? 100.0 / total : 0.0;
+
+    // 处理每个文件：工作线程按原子游标领取任务并发备份
+    std::atomic<std::size_t> next{0};
+    auto work = [&]() {
+        std::size_t i;
+        while (!cancelled.load(std::memory_order_relaxed) &&
+               (i = next.fetch_add(1)) < total) {
+            const auto& file_path = files[i];
+
+            {
+                std::lock_guard<std::mutex> lk(current_mutex);
+                current_file = file_path;
             }
-            return false;
-        }
+            processed.fetch_add(1);
 
-        // 更新进度
-        if (callback) {
-            double percentage = (i + 1) * 100.0 / files.size();
-            callback->onProgress(file_path, i + 1, files.size(), percentage);
-        }
-
-        // 应用过滤器
-        if (filter && !filter->shouldInclude(file_path)) {
-            skipped_count++;
-            if (callback) {
-                callback->onFileSkipped(file_path, "被过滤器排除");
+            // 应用过滤器（传现成的字符串，免去每个过滤器各自转换）
+            if (filter && !filter->shouldInclude(file_path.native())) {
+                skipped_count++;
+                if (callback) {
+                    std::lock_guard<std::mutex> lk(cb_mutex);
+                    callback->onFileSkipped(file_path, "被过滤器排除");
+                }
+                continue;
             }
-            continue;
-        }
 
-        // 检查文件类型
-        auto file_type = FilesystemUtils::getFileType(file_path);
-        if (!FilesystemUtils::isBackupSupported(file_type)) {
-            skipped_count++;
-            if (callback) {
-                callback->onFileSkipped(file_path, "不支持的文件类型");
-            }
-            continue;
-        }
-
-        // 备份文件
-        try {
-            auto relative_path = FileUtils::getRelativePath(source_root, file_path);
-            Metadata metadata;
-            if (!metadata.loadFromFile(file_path)) {
-                failed_count++;
+            // 检查文件类型（遍历时已记录，无需再 stat）
+            auto file_type = types[i];
+            if (!FilesystemUtils::isBackupSupported(file_type)) {
+                skipped_count++;
                 if (callback) {
-                    callback->onFileError(file_path, "读取元数据失败");
+                    std::lock_guard<std::mutex> lk(cb_mutex);
+                    callback->onFileSkipped(file_path, "不支持的文件类型");
                 }
                 continue;
             }
 
-            if (repo->storeFile(file_path, relative_path, metadata)) {
-                success_count++;
-                if (callback) {
-                    callback->onFileSuccess(file_path);
+            // 备份文件
+            try {
+                std::filesystem::path relative_path(
+                    file_path.native().substr(basePrefixLen));
+                Metadata metadata;
+                if (!metadata.loadFromFile(file_path)) {
+                    failed_count++;
+                    if (callback) {
+                        std::lock_guard<std::mutex> lk(cb_mutex);
+                        callback->onFileError(file_path, "读取元数据失败");
+                    }
+                    continue;
                 }
-            } else {
+
+                if (repo->storeFile(file_path, relative_path, metadata)) {
+                    success_count++;
+                    if (callback) {
+                        std::lock_guard<std::mutex> lk(cb_mutex);
+                        callback->onFileSuccess(file_path);
+                    }
+                } else {
+                    failed_count++;
+                    if (callback) {
+                        std::lock_guard<std::mutex> lk(cb_mutex);
+                        callback->onFileError(file_path, "存储到仓库失败");
+                    }
+                }
+            } catch (const std::exception& e) {
                 failed_count++;
                 if (callback) {
-                    callback->onFileError(file_path, "存储到仓库失败");
+                    std::lock_guard<std::mutex> lk(cb_mutex);
+                    callback->onFileError(file_path, std::string("异常: ") + e.what());
                 }
             }
-        } catch (const std::exception& e) {
-            failed_count++;
-            if (callback) {
-                callback->onFileError(file_path, std::string("异常: ") + e.what());
+        }
+    };
+
+    unsigned workers = std::thread::hardware_concurrency();
+    if (workers == 0) workers = 1;
+    workers = std::min<unsigned>({workers, 8u,
+                                  static_cast<unsigned>(files.size())});
+
+    std::atomic<unsigned> active{workers};
+    std::vector<std::thread> pool;
+    pool.reserve(workers);
+    for (unsigned t = 0; t < workers; ++t) {
+        pool.emplace_back([&]() {
+            work();
+            active.fetch_sub(1);
+        });
+    }
+
+    // 调用线程充当协调者：约 30Hz 上报进度、轮询取消请求
+    while (active.load() > 0) {
+        std::this_thread::sleep_for(std::chrono::milliseconds(33));
+        if (callback) {
+            std::filesystem::path cur;
+            {
+                std::lock_guard<std::mutex> lk(current_mutex);
+                cur = current_file;
+            }
+            std::size_t done_now = processed.load();
+
+            std::lock_guard<std::mutex> lk(cb_mutex);
+            if (callback->shouldCancel()) {
+                cancelled.store(true);
+            }
+            if (done_now > 0) {
+                callback->onProgress(cur, done_now, total, done_now * pct_scale);
             }
         }
     }
+    for (auto& th : pool) {
+        th.join();
+    }
+
+    // 收尾补一次满进度，保证进度条到达 100%
+    if (callback && !cancelled.load() && total > 0) {
+        std::lock_guard<std::mutex> lk(cb_mutex);
+        callback->onProgress(current_file, total, total, 100.0);
+    }
+
+    if (cancelled.load()) {
+        if (callback) {
+            callback->onComplete(success_count, failed_count, skipped_count, false);
+        }
+        return false;
+    }
 
     // 保存索引
     if (!repo->saveIndex()) {
@@ -163,34 +283,50 @@ bool GuiOperations::restoreWithProgress(
         return false;
     }
 
-    // 获取文件列表
+    // 获取文件列表（总数与百分比系数是循环不变量，提出循环算一次）
     auto files = repo->listFiles();
+    const std::size_t total = files.size();
+    const double pct_scale = total > 0 ? 100.0 / total : 0.0;
 
     // 通知开始
     if (callback) {
-        callback->onStart(files.size(), "还原");
+        callback->onStart(total, "还原");
     }
 
     std::size_t success_count = 0;
     std::size_t failed_count = 0;
     std::size_t skipped_count = 0;
 
+    // 进度节流：小文件密集时每个文件都刷一次 UI 纯属浪费，
+    // 单调时钟限到约 30Hz，最后一个文件无条件上报保证到 100%
+    auto last_update = std::chrono::steady_clock::now();
+    constexpr auto kProgressInterval = std::chrono::milliseconds(33);
+
+    // 取消协作化：shouldCancel 是虚调用且实现方可能查询 UI 状态，
+    // 跟进度上报共用同一节流窗口轮询，结果锁存到本地标志
+    bool cancel_requested = false;
+
     // 还原每个文件
-    for (std::size_t i = 0; i < files.size(); ++i) {
+    for (std::size_t i = 0; i < total; ++i) {
         const auto& relative_path = files[i];
 
-        // 检查是否取消
-        if (callback && callback->shouldCancel()) {
+        // 检查是否取消（节流轮询的锁存结果）
+        if (cancel_requested) {
             if (callback) {
                 callback->onComplete(success_count, failed_count, skipped_count, false);
             }
             return false;
         }
 
-        // 更新进度
+        // 更新进度 + 轮询取消
         if (callback) {
-            double percentage = (i + 1) * 100.0 / files.size();
-            callback->onProgress(relative_path, i + 1, files.size(), percentage);
+            auto now = std::chrono::steady_clock::now();
+            if (now - last_update >= kProgressInterval || i + 1 == total) {
+                last_update = now;
+                cancel_requested = callback->shouldCancel();
+                callback->onProgress(relative_path, i + 1, total,
+                                     (i + 1) * pct_scale);
+            }
         }
 
         // 还原文件
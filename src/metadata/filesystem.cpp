@@ -25,9 +25,15 @@
 namespace backuprestore {
 
 FilesystemUtils::FileType FilesystemUtils::getFileType(const std::filesystem::path& path) {
+    return getFileType(path.string());
+}
+
+FilesystemUtils::FileType FilesystemUtils::getFileType(const std::string& p) {
     struct stat st{};
-    const std::string p = path.string();
+    return getFileType(p, st);
+}
 
+FilesystemUtils::FileType FilesystemUtils::getFileType(const std::string& p, struct stat& st) {
 #ifdef _WIN32
     // Windows 没有 lstat：用 stat（符号链接会当作目标）
     int ret = stat(p.c_str(), &st);
@@ -2,6 +2,7 @@
 
 #include <string>
 #include <filesystem>
+#include <sys/stat.h>
 
 namespace backuprestore {
 
@@ -26,6 +27,17 @@ public:
      */
     static FileType getFileType(const std::filesystem::path& path);
 
+    /**
+     * @brief 获取文件类型（字符串路径版本，热路径上省掉一次 path->string 转换）
+     */
+    static FileType getFileType(const std::string& path);
+
+    /**
+     * @brief 获取文件类型并把 stat 结果交还给调用方，
+     * 后续读取元数据可直接复用，同一 inode 只 lstat 一次
+     */
+    static FileType getFileType(const std::string& path, struct stat& st_out);
+
     /**
      * @brief 检查文件类型是否支持备份
      */
@@ -2,10 +2,10 @@
 
 #include <sys/stat.h>
 #include <sys/time.h>
+#include <fcntl.h>
 #include <utime.h>
-#include <array>
+#include <charconv>
 
-#include <sstream>
 #include <iostream>
 
 #ifdef _WIN32
@@ -17,25 +17,6 @@
 namespace backuprestore {
 
 bool Metadata::loadFromFile(const std::filesystem::path& path) {
-    if (!std::filesystem::exists(path)) {
-        return false;
-    }
-
-    // 检查是否为符号链接（Windows 也支持 is_symlink，但后续 lstat 不一定可用）
-    is_symlink = std::filesystem::is_symlink(path);
-    if (is_symlink) {
-        try {
-            symlink_target = std::filesystem::read_symlink(path).string();
-        } catch (const std::exception& e) {
-            std::cerr << "读取符号链接目标失败: " << path << " - " << e.what() << std::endl;
-            return false;
-        }
-    }
-
-    return loadFromStat(path);
-}
-
-bool Metadata::loadFromStat(const std::filesystem::path& path) {
     struct stat st{};
 
     // Windows 下：std::filesystem::path::c_str() 是 wchar_t*，不能直接给 stat/chmod
@@ -46,8 +27,9 @@ bool Metadata::loadFromStat(const std::filesystem::path& path) {
     // Windows 下没有 lstat，直接用 stat（符号链接会当作目标文件处理）
     int result = stat(p.c_str(), &st);
 #else
-    // POSIX：符号链接用 lstat 获取链接本身信息，否则用 stat
-    int result = is_symlink ? lstat(p.c_str(), &st) : stat(p.c_str(), &st);
+    // POSIX：一次 lstat 同时拿到存在性、类型和元数据，
+    // 不再先走 exists()/is_symlink() 各自的重复 stat
+    int result = lstat(p.c_str(), &st);
 #endif
 
     if (result != 0) {
@@ -55,6 +37,25 @@ bool Metadata::loadFromStat(const std::filesystem::path& path) {
         return false;
     }
 
+    return loadFromStat(path, st);
+}
+
+bool Metadata::loadFromStat(const std::filesystem::path& path, const struct stat& st) {
+#if !defined(_WIN32) && defined(S_IFLNK)
+    is_symlink = ((st.st_mode & S_IFMT) == S_IFLNK);
+#else
+    is_symlink = false;
+#endif
+
+    if (is_symlink) {
+        try {
+            symlink_target = std::filesystem::read_symlink(path).string();
+        } catch (const std::exception& e) {
+            std::cerr << "读取符号链接目标失败: " << path << " - " << e.what() << std::endl;
+            return false;
+        }
+    }
+
     mode = st.st_mode;
     mtime = st.st_mtime;
     uid = st.st_uid;  // 预留（Windows 下意义不大）
@@ -66,6 +67,12 @@ bool Metadata::loadFromStat(const std::filesystem::path& path) {
 bool Metadata::applyToFile(const std::filesystem::path& path) const {
     const std::string p = path.string();
 
+    // 符号链接本身在 Linux 上没有独立权限，chmod 会穿透到目标
+    // （目标此刻可能还没还原出来），直接跳过权限与时间设置
+    if (is_symlink) {
+        return true;
+    }
+
     // 应用权限（Windows 下 chmod 只能设置“只读”一类的属性，效果有限，但能跑）
     if (chmod(p.c_str(), mode) != 0) {
         std::cerr << "设置文件权限失败: " << path << std::endl;
@@ -115,41 +122,67 @@ bool Metadata::applyToFile(const std::filesystem::path& path) const {
 }
 
 std::string Metadata::serialize() const {
-    std::ostringstream oss;
-    oss << mode << ":" << mtime << ":" << uid << ":" << gid
-        << ":" << (is_symlink ? 1 : 0) << ":" << symlink_target;
-    return oss.str();
+    // 数值字段用 to_chars 直接写入栈上缓冲，绕过 ostringstream 的
+    // locale/虚函数层；格式保持 mode:mtime:uid:gid:is_symlink:target 不变
+    char buf[96];
+    char* p = buf;
+
+    auto put_u32 = [&p](std::uint32_t v) {
+        p = std::to_chars(p, p + 10, v).ptr;
+        *p++ = ':';
+    };
+
+    put_u32(mode);
+    p = std::to_chars(p, p + 20, static_cast<long long>(mtime)).ptr;
+    *p++ = ':';
+    put_u32(uid);
+    put_u32(gid);
+    *p++ = is_symlink ? '1' : '0';
+    *p++ = ':';
+
+    std::string result(buf, static_cast<size_t>(p - buf));
+    result += symlink_target;
+    return result;
 }
 
 bool Metadata::deserialize(const std::string& data) {
     // 期望格式：
     // mode:mtime:uid:gid:is_symlink:symlink_target(可包含冒号)
-    std::array<std::string, 6> fields;
-    size_t start = 0;
-
-    for (int i = 0; i < 5; ++i) {
-        size_t pos = data.find(':', start);
-        if (pos == std::string::npos) return false;
-        fields[i] = data.substr(start, pos - start);
-        start = pos + 1;
-    }
-    fields[5] = data.substr(start); // 剩余全部
-
-    try {
-        mode = std::stoul(fields[0]);
-        mtime = std::stoll(fields[1]);
-        uid  = std::stoul(fields[2]);
-        gid  = std::stoul(fields[3]);
-
-        int s = std::stoi(fields[4]);
-        if (s != 0 && s != 1) return false;
-        is_symlink = (s == 1);
-
-        symlink_target = fields[5];
-    } catch (const std::exception& e) {
-        std::cerr << "反序列化元数据失败: " << e.what() << std::endl;
-        return false;
-    }
+    // 用 from_chars 原地解析，不再为每个字段切 substr / 抛异常
+    const char* p = data.data();
+    const char* end = p + data.size();
+
+    auto parse_u32 = [&p, end](std::uint32_t& out) -> bool {
+        auto r = std::from_chars(p, end, out);
+        if (r.ec != std::errc() || r.ptr == end || *r.ptr != ':') return false;
+        p = r.ptr + 1;
+        return true;
+    };
+
+    std::uint32_t m = 0, u = 0, g = 0;
+    long long mt = 0;
+    int sym = 0;
+
+    if (!parse_u32(m)) return false;
+
+    auto r = std::from_chars(p, end, mt);
+    if (r.ec != std::errc() || r.ptr == end || *r.ptr != ':') return false;
+    p = r.ptr + 1;
+
+    if (!parse_u32(u)) return false;
+    if (!parse_u32(g)) return false;
+
+    r = std::from_chars(p, end, sym);
+    if (r.ec != std::errc() || r.ptr == end || *r.ptr != ':') return false;
+    p = r.ptr + 1;
+    if (sym != 0 && sym != 1) return false;
+
+    mode = m;
+    mtime = static_cast<std::time_t>(mt);
+    uid = u;
+    gid = g;
+    is_symlink = (sym == 1);
+    symlink_target.assign(p, end);
 
     return true;
 }
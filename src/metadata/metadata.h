@@ -4,6 +4,7 @@
 #include <filesystem>
 #include <cstdint>
 #include <ctime>
+#include <sys/stat.h>
 
 namespace backuprestore {
 
@@ -28,6 +29,14 @@ public:
      */
     bool loadFromFile(const std::filesystem::path& path);
 
+    /**
+     * @brief 从调用方已取得的 stat 结果填充元数据
+     * @param path 文件路径（仅用于读取符号链接目标）
+     * @param st 现成的 lstat 结果，避免对同一 inode 再 stat 一次
+     * @return 是否成功
+     */
+    bool loadFromStat(const std::filesystem::path& path, const struct stat& st);
+
     /**
      * @brief 将元数据应用到文件
      * @param path 文件路径
@@ -47,12 +56,6 @@ public:
      * @return 是否成功
      */
     bool deserialize(const std::string& data);
-
-private:
-    /**
-     * @brief 从stat结构获取元数据（Linux系统调用）
-     */
-    bool loadFromStat(const std::filesystem::path& path);
 };
 
 } // namespace backuprestore
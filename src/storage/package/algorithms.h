@@ -23,4 +23,24 @@ inline EncryptAlg parseEncrypt(const std::string& s) {
     return EncryptAlg::None;
 }
 
+// 导入端 code -> 枚举的直查式转换：常量时间，且顺带校验合法性，
+// 非法字节不再被盲目 static_cast 成未定义的枚举值
+inline bool packFromCode(uint8_t v, PackAlg& out) {
+    if (v < 1 || v > 2) return false;
+    out = static_cast<PackAlg>(v);
+    return true;
+}
+
+inline bool compressFromCode(uint8_t v, CompressAlg& out) {
+    if (v > 1) return false;
+    out = static_cast<CompressAlg>(v);
+    return true;
+}
+
+inline bool encryptFromCode(uint8_t v, EncryptAlg& out) {
+    if (v > 2) return false;
+    out = static_cast<EncryptAlg>(v);
+    return true;
+}
+
 } // namespace pkg
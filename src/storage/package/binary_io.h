@@ -17,22 +17,47 @@ inline uint8_t read_u8(std::istream& is) {
     return static_cast<uint8_t>(c);
 }
 
+// 整数先在栈上凑成小端字节，再一次 write/read 过流层，
+// 避免 sizeof(T) 次 put/get 各自走一遍流的哨兵与检查逻辑
 template <typename T>
 inline void write_le(std::ostream& os, T v) {
     static_assert(std::is_integral<T>::value, "write_le requires integral");
+    char b[sizeof(T)];
     for (size_t i = 0; i < sizeof(T); ++i) {
-        os.put(static_cast<char>((static_cast<uint64_t>(v) >> (8 * i)) & 0xFF));
+        b[i] = static_cast<char>((static_cast<uint64_t>(v) >> (8 * i)) & 0xFF);
     }
+    os.write(b, sizeof(T));
 }
 
 template <typename T>
 inline T read_le(std::istream& is) {
     static_assert(std::is_integral<T>::value, "read_le requires integral");
+    char b[sizeof(T)];
+    is.read(b, sizeof(T));
+    if (!is) throw std::runtime_error("read_le: EOF");
     uint64_t v = 0;
     for (size_t i = 0; i < sizeof(T); ++i) {
-        int c = is.get();
-        if (c == EOF) throw std::runtime_error("read_le: EOF");
-        v |= (static_cast<uint64_t>(static_cast<uint8_t>(c)) << (8 * i));
+        v |= (static_cast<uint64_t>(static_cast<uint8_t>(b[i])) << (8 * i));
+    }
+    return static_cast<T>(v);
+}
+
+// 缓冲区版本：把整数按小端追加到内存缓冲，便于把多个字段攒成一次写出
+template <typename T>
+inline void append_le(std::string& buf, T v) {
+    static_assert(std::is_integral<T>::value, "append_le requires integral");
+    for (size_t i = 0; i < sizeof(T); ++i) {
+        buf.push_back(static_cast<char>((static_cast<uint64_t>(v) >> (8 * i)) & 0xFF));
+    }
+}
+
+// 内存解析版本：从整块读入的缓冲里顺序取小端整数，游标前移由调用方掌控
+template <typename T>
+inline T parse_le(const uint8_t* p) {
+    static_assert(std::is_integral<T>::value, "parse_le requires integral");
+    uint64_t v = 0;
+    for (size_t i = 0; i < sizeof(T); ++i) {
+        v |= (static_cast<uint64_t>(p[i]) << (8 * i));
     }
     return static_cast<T>(v);
 }
@@ -1,4 +1,5 @@
 #include "compress_rle.h"
+#include <cstring>
 #include <stdexcept>
 
 namespace pkg {
@@ -8,15 +9,30 @@ std::vector<uint8_t> rle_compress(const std::vector<uint8_t>& in) {
     std::vector<uint8_t> out;
     if (in.empty()) return out;
 
-    size_t i = 0;
-    while (i < in.size()) {
-        uint8_t b = in[i];
-        size_t j = i + 1;
-        while (j < in.size() && in[j] == b && (j - i) < 255) ++j;
-        uint8_t count = static_cast<uint8_t>(j - i);
-        out.push_back(count);
+    // 预留容量，避免逐对 push_back 时反复扩容
+    out.reserve(in.size() + 16);
+
+    const uint8_t* p = in.data();
+    const uint8_t* end = p + in.size();
+
+    while (p < end) {
+        uint8_t b = *p;
+        const uint8_t* limit = (end - p > 255) ? p + 255 : end;
+        const uint8_t* q = p + 1;
+
+        // 先按 8 字节一组探测 run 边界，再逐字节收尾
+        uint64_t splat = UINT64_C(0x0101010101010101) * b;
+        while (q + 8 <= limit) {
+            uint64_t w;
+            std::memcpy(&w, q, 8);
+            if (w != splat) break;
+            q += 8;
+        }
+        while (q < limit && *q == b) ++q;
+
+        out.push_back(static_cast<uint8_t>(q - p));
         out.push_back(b);
-        i = j;
+        p = q;
     }
     return out;
 }
@@ -26,11 +42,19 @@ std::vector<uint8_t> rle_decompress(const std::vector<uint8_t>& in) {
     if (in.empty()) return out;
     if (in.size() % 2 != 0) throw std::runtime_error("RLE data corrupted");
 
+    // 第一遍：校验并统计总长度，一次性分配输出
+    size_t total = 0;
+    for (size_t i = 0; i < in.size(); i += 2) {
+        if (in[i] == 0) throw std::runtime_error("RLE count=0 corrupted");
+        total += in[i];
+    }
+    out.resize(total);
+
+    // 第二遍：每个 run 直接 memset，避免逐对 insert 的增量扩容
+    uint8_t* dst = out.data();
     for (size_t i = 0; i < in.size(); i += 2) {
-        uint8_t count = in[i];
-        uint8_t b = in[i + 1];
-        if (count == 0) throw std::runtime_error("RLE count=0 corrupted");
-        out.insert(out.end(), count, b);
+        std::memset(dst, in[i + 1], in[i]);
+        dst += in[i];
     }
     return out;
 }
@@ -12,32 +12,80 @@ static std::vector<uint8_t> make_key(const std::string& password, const std::vec
     return key;
 }
 
+// KSA：根据 key 初始化 S 盒。
+// 密钥下标用回绕计数器代替每轮 i % key.size()，
+// 交换与 PRGA 一致地用临时变量展开
+static void rc4_init(std::array<uint8_t, 256>& S, const std::vector<uint8_t>& key) {
+    for (int i = 0; i < 256; ++i) S[i] = static_cast<uint8_t>(i);
+
+    const uint8_t* k = key.data();
+    const size_t klen = key.size();
+
+    size_t ki = 0;
+    uint8_t j = 0;
+    for (int i = 0; i < 256; ++i) {
+        j = static_cast<uint8_t>(j + S[i] + k[ki]);
+        if (++ki == klen) ki = 0;
+        uint8_t t = S[i];
+        S[i] = S[j];
+        S[j] = t;
+    }
+}
+
+// PRGA：索引用 uint8_t 自然回绕代替 & 0xFF，
+// 交换用临时变量展开，S 盒通过裸指针访问，保证循环体足够紧凑。
+// src 和 dst 允许是同一块缓冲（原地加/解密）
+static void rc4_apply(std::array<uint8_t, 256>& S,
+                      const uint8_t* src, uint8_t* dst, size_t n) {
+    uint8_t* s = S.data();
+    uint8_t pi = 0, pj = 0;
+    for (size_t k = 0; k < n; ++k) {
+        pi = static_cast<uint8_t>(pi + 1);
+        uint8_t si = s[pi];
+        pj = static_cast<uint8_t>(pj + si);
+        uint8_t sj = s[pj];
+        s[pi] = sj;
+        s[pj] = si;
+        dst[k] = src[k] ^ s[static_cast<uint8_t>(si + sj)];
+    }
+}
+
+Rc4KeySchedule rc4_prepare(const std::string& password,
+                           const std::vector<uint8_t>& salt) {
+    Rc4KeySchedule ks;
+    auto key = make_key(password, salt);
+    rc4_init(ks.S, key);
+    return ks;
+}
+
 std::vector<uint8_t> rc4_crypt(const std::vector<uint8_t>& in,
                               const std::string& password,
                               const std::vector<uint8_t>& salt) {
     auto key = make_key(password, salt);
 
     std::array<uint8_t, 256> S{};
-    for (int i = 0; i < 256; ++i) S[i] = static_cast<uint8_t>(i);
-
-    // KSA
-    int j = 0;
-    for (int i = 0; i < 256; ++i) {
-        j = (j + S[i] + key[i % key.size()]) & 0xFF;
-        std::swap(S[i], S[j]);
-    }
+    rc4_init(S, key);
 
-    // PRGA
     std::vector<uint8_t> out(in.size());
-    int i = 0; j = 0;
-    for (size_t k = 0; k < in.size(); ++k) {
-        i = (i + 1) & 0xFF;
-        j = (j + S[i]) & 0xFF;
-        std::swap(S[i], S[j]);
-        uint8_t rnd = S[(S[i] + S[j]) & 0xFF];
-        out[k] = in[k] ^ rnd;
-    }
+    rc4_apply(S, in.data(), out.data(), in.size());
     return out;
 }
 
+void rc4_crypt_inplace(std::vector<uint8_t>& buf,
+                       const std::string& password,
+                       const std::vector<uint8_t>& salt) {
+    auto key = make_key(password, salt);
+
+    std::array<uint8_t, 256> S{};
+    rc4_init(S, key);
+    rc4_apply(S, buf.data(), buf.data(), buf.size());
+}
+
+void rc4_crypt_inplace(std::vector<uint8_t>& buf, const Rc4KeySchedule& ks) {
+    // PRGA 会改写 S 盒：复制一份调度到栈上（256 字节），
+    // 原始调度保持只读，可被多个线程同时复用
+    std::array<uint8_t, 256> S = ks.S;
+    rc4_apply(S, buf.data(), buf.data(), buf.size());
+}
+
 } // namespace pkg
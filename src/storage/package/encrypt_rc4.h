@@ -1,14 +1,33 @@
 #pragma once
+#include <array>
 #include <cstdint>
 #include <string>
 #include <vector>
 
 namespace pkg {
 
+// 预计算的密钥调度：KSA 之后的 S 盒。同一个包内 password+salt 固定，
+// 调度只需做一次，逐 payload 复制 S 盒跑 PRGA 即可（输出与逐次 KSA 等价）
+struct Rc4KeySchedule {
+    std::array<uint8_t, 256> S{};
+};
+
+// 由 password+salt 做一次 KSA，得到可跨 payload 复用的调度
+Rc4KeySchedule rc4_prepare(const std::string& password,
+                           const std::vector<uint8_t>& salt);
+
 // RC4 流加密/解密（同一个函数）
 // salt: 每个包随机生成，用于增强 key
 std::vector<uint8_t> rc4_crypt(const std::vector<uint8_t>& in,
                               const std::string& password,
                               const std::vector<uint8_t>& salt);
 
+// 原地版本：直接在 buf 上加/解密，不分配输出缓冲
+void rc4_crypt_inplace(std::vector<uint8_t>& buf,
+                       const std::string& password,
+                       const std::vector<uint8_t>& salt);
+
+// 原地版本（预计算调度）：跳过每次的 key 拼装与 256 轮 KSA
+void rc4_crypt_inplace(std::vector<uint8_t>& buf, const Rc4KeySchedule& ks);
+
 } // namespace pkg
@@ -1,33 +1,84 @@
 #include "encrypt_xor.h"
 #include <cstdint>
+#include <cstring>
 
 namespace pkg {
 
-// FNV-1a 32bit hash
+// FNV-1a 32bit hash：内核按裸字节区间推进，password 和 salt
+// 两段连续喂入同一状态，等价于对拼接后的缓冲区做一次哈希（但无需拼接分配）
+static inline uint32_t fnv1a32_step(uint32_t h, const uint8_t* p, size_t n) {
+    for (size_t i = 0; i < n; ++i) {
+        h ^= p[i];
+        h *= 16777619u;
+    }
+    return h;
+}
+
 static uint32_t fnv1a32(const std::string& s, const std::vector<uint8_t>& salt) {
     uint32_t h = 2166136261u;
-    for (unsigned char c : s) { h ^= c; h *= 16777619u; }
-    for (uint8_t b : salt) { h ^= b; h *= 16777619u; }
+    h = fnv1a32_step(h, reinterpret_cast<const uint8_t*>(s.data()), s.size());
+    h = fnv1a32_step(h, salt.data(), salt.size());
     return h;
 }
 
 // xorshift32 生成伪随机字节流（教学用）
-static uint8_t next_byte(uint32_t& x) {
+static inline uint8_t next_byte(uint32_t& x) {
     x ^= x << 13;
     x ^= x >> 17;
     x ^= x << 5;
     return static_cast<uint8_t>(x & 0xFF);
 }
 
+// 密钥流生成内核：一次性把 n 字节密钥流写入 dst，
+// 状态通过引用推进，便于分块调用时续流
+static void fill_keystream(uint8_t* dst, size_t n, uint32_t& state) {
+    for (size_t i = 0; i < n; ++i) {
+        dst[i] = next_byte(state);
+    }
+}
+
+// dst ^= src，按 8 字节一组批量异或，尾部逐字节收尾
+static void xor_into(uint8_t* dst, const uint8_t* src, size_t n) {
+    size_t i = 0;
+    for (; i + 8 <= n; i += 8) {
+        uint64_t a, b;
+        std::memcpy(&a, dst + i, 8);
+        std::memcpy(&b, src + i, 8);
+        a ^= b;
+        std::memcpy(dst + i, &a, 8);
+    }
+    for (; i < n; ++i) {
+        dst[i] ^= src[i];
+    }
+}
+
 std::vector<uint8_t> xor_crypt(const std::vector<uint8_t>& in,
                               const std::string& password,
                               const std::vector<uint8_t>& salt) {
-    std::vector<uint8_t> out(in.size());
+    // 复制输入后走分块原地路径：密钥流始终只占一个 4KiB 栈缓冲，
+    // 常驻 L1，不再按明文长度分配整条密钥流
+    std::vector<uint8_t> out(in);
+    xor_crypt_inplace(out, password, salt);
+    return out;
+}
+
+void xor_crypt_inplace(std::vector<uint8_t>& buf,
+                       const std::string& password,
+                       const std::vector<uint8_t>& salt) {
+    // 分块生成密钥流到栈上缓冲，再批量异或进 buf，
+    // 全程只碰 buf 本身，不额外分配
     uint32_t state = fnv1a32(password, salt);
-    for (size_t i = 0; i < in.size(); ++i) {
-        out[i] = in[i] ^ next_byte(state);
+    uint8_t block[4096];
+
+    size_t off = 0;
+    const size_t n = buf.size();
+    while (off < n) {
+        size_t chunk = n - off;
+        if (chunk > sizeof(block)) chunk = sizeof(block);
+        fill_keystream(block, chunk, state);
+        xor_into(buf.data() + off, block, chunk);
+        off += chunk;
     }
-    return out;
 }
 
 } // namespace pkg
@@ -11,4 +11,9 @@ std::vector<uint8_t> xor_crypt(const std::vector<uint8_t>& in,
                               const std::string& password,
                               const std::vector<uint8_t>& salt);
 
+// 原地版本：直接在 buf 上加/解密，不分配输出缓冲
+void xor_crypt_inplace(std::vector<uint8_t>& buf,
+                       const std::string& password,
+                       const std::vector<uint8_t>& salt);
+
 } // namespace pkg
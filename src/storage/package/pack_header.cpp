@@ -4,13 +4,41 @@
 namespace pkg {
 
 // 写入：fileCount + [path + origSize + storedSize + data]...
+void pack_header_write_count(std::ostream& os, uint32_t count) {
+    write_le<uint32_t>(os, count);
+}
+
+void pack_header_write_entry_head(std::ostream& os, const std::string& relPath,
+                                  uint64_t origSize, uint64_t storedSize,
+                                  std::string& scratch) {
+    // pathLen + path + origSize + storedSize 攒进一个小缓冲一次写出，
+    // 不再逐字段（逐字节）经过流层；缓冲跨 entry 复用，容量只增不减
+    scratch.clear();
+    scratch.reserve(4 + relPath.size() + 16);
+    append_le<uint32_t>(scratch, static_cast<uint32_t>(relPath.size()));
+    scratch.append(relPath);
+    append_le<uint64_t>(scratch, origSize);
+    append_le<uint64_t>(scratch, storedSize);
+
+    os.write(scratch.data(), static_cast<std::streamsize>(scratch.size()));
+}
+
+void pack_header_write_entry(std::ostream& os, const Entry& e, std::string& scratch) {
+    pack_header_write_entry_head(os, e.relPath, e.originalSize,
+                                 static_cast<uint64_t>(e.payload.size()), scratch);
+    write_bytes(os, e.payload);
+}
+
+void pack_header_write_entry(std::ostream& os, const Entry& e) {
+    std::string head;
+    pack_header_write_entry(os, e, head);
+}
+
 void pack_header_write(std::ostream& os, const std::vector<Entry>& entries) {
-    write_le<uint32_t>(os, static_cast<uint32_t>(entries.size()));
+    pack_header_write_count(os, static_cast<uint32_t>(entries.size()));
+    std::string head;
     for (const auto& e : entries) {
-        write_string(os, e.relPath);
-        write_le<uint64_t>(os, e.originalSize);
-        write_le<uint64_t>(os, static_cast<uint64_t>(e.payload.size()));
-        write_bytes(os, e.payload);
+        pack_header_write_entry(os, e, head);
     }
 }
 
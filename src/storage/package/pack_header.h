@@ -17,4 +17,17 @@ struct Entry {
 void pack_header_write(std::ostream& os, const std::vector<Entry>& entries);
 std::vector<Entry> pack_header_read(std::istream& is);
 
+// 流式写入：先写 fileCount，再逐个写 entry（payload 写完即可释放）
+void pack_header_write_count(std::ostream& os, uint32_t count);
+void pack_header_write_entry(std::ostream& os, const Entry& e);
+
+// scratch 版本：头部缓冲由调用方持有并跨 entry 复用，循环内零分配
+void pack_header_write_entry(std::ostream& os, const Entry& e, std::string& scratch);
+
+// 只写 entry 头（pathLen + path + origSize + storedSize），payload 由调用方
+// 自行流式写出——供直存模式按块搬运文件内容时使用
+void pack_header_write_entry_head(std::ostream& os, const std::string& relPath,
+                                  uint64_t origSize, uint64_t storedSize,
+                                  std::string& scratch);
+
 } // namespace pkg
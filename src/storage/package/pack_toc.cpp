@@ -1,5 +1,6 @@
 #include "pack_toc.h"
 #include "binary_io.h"
+#include <cstring>
 #include <stdexcept>
 
 namespace pkg {
@@ -20,25 +21,34 @@ void pack_toc_write(std::ostream& os,
         write_bytes(os, blobs[i]);
     }
 
+    pack_toc_write_index(os, local);
+}
+
+void pack_toc_write_index(std::ostream& os, const std::vector<TocItem>& toc) {
     uint64_t tocOffset = static_cast<uint64_t>(os.tellp());
 
-    // 写 TOC block
-    os.write(TOC_MAGIC, 4);
-    write_le<uint32_t>(os, static_cast<uint32_t>(local.size()));
-    for (const auto& item : local) {
-        write_string(os, item.relPath);
-        write_le<uint64_t>(os, item.originalSize);
-        write_le<uint64_t>(os, item.offset);
-        write_le<uint64_t>(os, item.storedSize);
+    // 整个 TOC 块（magic + count + 条目 + 末尾 tocOffset）
+    // 攒进一个缓冲，最后一次写出
+    std::string buf;
+    buf.reserve(16 + toc.size() * 64);
+
+    buf.append(TOC_MAGIC, 4);
+    append_le<uint32_t>(buf, static_cast<uint32_t>(toc.size()));
+    for (const auto& item : toc) {
+        append_le<uint32_t>(buf, static_cast<uint32_t>(item.relPath.size()));
+        buf.append(item.relPath);
+        append_le<uint64_t>(buf, item.originalSize);
+        append_le<uint64_t>(buf, item.offset);
+        append_le<uint64_t>(buf, item.storedSize);
     }
 
     // 文件末尾写 tocOffset（方便反向读）
-    write_le<uint64_t>(os, tocOffset);
+    append_le<uint64_t>(buf, tocOffset);
+
+    os.write(buf.data(), static_cast<std::streamsize>(buf.size()));
 }
 
-void pack_toc_read(std::istream& is,
-                   std::vector<TocItem>& tocOut,
-                   std::vector<std::vector<uint8_t>>& blobsOut) {
+void pack_toc_read_index(std::istream& is, std::vector<TocItem>& tocOut) {
     // 读最后8字节 tocOffset
     is.seekg(0, std::ios::end);
     auto endPos = is.tellg();
@@ -47,29 +57,55 @@ void pack_toc_read(std::istream& is,
     is.seekg(endPos - std::streamoff(8), std::ios::beg);
     uint64_t tocOffset = read_le<uint64_t>(is);
 
-    // 跳到 tocOffset 读取 TOC
+    // 整个 TOC 块（tocOffset 到文件末尾前8字节）一次读入，
+    // 再从内存游标解析，大 TOC 不必每个字段都过一遍流层
+    uint64_t blockLen = static_cast<uint64_t>(endPos) - 8;
+    if (tocOffset > blockLen) throw std::runtime_error("bad tocOffset");
+    blockLen -= tocOffset;
+
     is.seekg(static_cast<std::streamoff>(tocOffset), std::ios::beg);
+    auto block = read_bytes(is, static_cast<size_t>(blockLen));
 
-    char magic[4];
-    is.read(magic, 4);
-    if (!is || std::string(magic, 4) != std::string(TOC_MAGIC, 4))
+    const uint8_t* p = block.data();
+    const uint8_t* end = p + block.size();
+    auto need = [&](size_t n) {
+        if (static_cast<size_t>(end - p) < n) throw std::runtime_error("TOC truncated");
+    };
+
+    need(8);
+    if (std::memcmp(p, TOC_MAGIC, 4) != 0)
         throw std::runtime_error("TOC magic mismatch");
+    p += 4;
 
-    uint32_t n = read_le<uint32_t>(is);
+    uint32_t n = parse_le<uint32_t>(p);
+    p += 4;
 
     tocOut.clear();
     tocOut.reserve(n);
 
     for (uint32_t i = 0; i < n; ++i) {
+        need(4);
+        uint32_t pathLen = parse_le<uint32_t>(p);
+        p += 4;
+
+        need(static_cast<size_t>(pathLen) + 24);
         TocItem item;
-        item.relPath = read_string(is);
-        item.originalSize = read_le<uint64_t>(is);
-        item.offset = read_le<uint64_t>(is);
-        item.storedSize = read_le<uint64_t>(is);
+        item.relPath.assign(reinterpret_cast<const char*>(p), pathLen);
+        p += pathLen;
+        item.originalSize = parse_le<uint64_t>(p); p += 8;
+        item.offset = parse_le<uint64_t>(p);       p += 8;
+        item.storedSize = parse_le<uint64_t>(p);   p += 8;
         tocOut.push_back(std::move(item));
     }
+}
+
+void pack_toc_read(std::istream& is,
+                   std::vector<TocItem>& tocOut,
+                   std::vector<std::vector<uint8_t>>& blobsOut) {
+    pack_toc_read_index(is, tocOut);
 
     // 根据 toc 读 blobs
+    uint32_t n = static_cast<uint32_t>(tocOut.size());
     blobsOut.clear();
     blobsOut.reserve(n);
 
@@ -20,8 +20,14 @@ void pack_toc_write(std::ostream& os,
                     const std::vector<TocItem>& toc,
                     const std::vector<std::vector<uint8_t>>& blobs);
 
+// 仅写 TOC 块 + tocOffset（blob 已由调用方自行写出并填好 offset/storedSize）
+void pack_toc_write_index(std::ostream& os, const std::vector<TocItem>& toc);
+
 void pack_toc_read(std::istream& is,
                    std::vector<TocItem>& tocOut,
                    std::vector<std::vector<uint8_t>>& blobsOut);
 
+// 仅读 TOC 块（不读 blob），blob 由调用方按 offset/storedSize 自取
+void pack_toc_read_index(std::istream& is, std::vector<TocItem>& tocOut);
+
 } // namespace pkg
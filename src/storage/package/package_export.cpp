@@ -6,21 +6,74 @@
 #include "pack_header.h"
 #include "pack_toc.h"
 
+#include <algorithm>
+#include <atomic>
+#include <deque>
 #include <fstream>
+#include <mutex>
+#include <optional>
+#include <future>
 #include <random>
 #include <vector>
 #include <stdexcept>
+#include <thread>
+#include <unordered_set>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
 
 namespace pkg {
 
 static std::vector<uint8_t> gen_salt(size_t n = 16) {
     std::vector<uint8_t> s(n);
+#ifndef _WIN32
+    // 优先一次性从内核 CSPRNG 读满整个缓冲区（避免逐字节取随机数，
+    // random_device 每次调用都可能是一个系统调用）
+    std::ifstream urnd("/dev/urandom", std::ios::binary);
+    if (urnd && urnd.read(reinterpret_cast<char*>(s.data()), static_cast<std::streamsize>(n))) {
+        return s;
+    }
+#endif
     std::random_device rd;
     for (size_t i = 0; i < n; ++i) s[i] = static_cast<uint8_t>(rd() & 0xFF);
     return s;
 }
 
 static std::vector<uint8_t> read_file_all(const std::filesystem::path& p) {
+#ifndef _WIN32
+    // 打包会连续读大量文件：走 POSIX 读路径并用 fadvise 告知内核
+    // 顺序访问 + 预读，让批量读取尽量流水线化
+    int fd = ::open(p.c_str(), O_RDONLY);
+    if (fd < 0) throw std::runtime_error("open file failed: " + p.string());
+
+    struct stat st{};
+    if (fstat(fd, &st) != 0) {
+        ::close(fd);
+        throw std::runtime_error("stat file failed: " + p.string());
+    }
+
+#ifdef POSIX_FADV_SEQUENTIAL
+    posix_fadvise(fd, 0, st.st_size, POSIX_FADV_SEQUENTIAL);
+    posix_fadvise(fd, 0, st.st_size, POSIX_FADV_WILLNEED);
+#endif
+
+    std::vector<uint8_t> buf(static_cast<size_t>(st.st_size));
+    size_t off = 0;
+    while (off < buf.size()) {
+        ssize_t r = ::read(fd, buf.data() + off, buf.size() - off);
+        if (r <= 0) {
+            ::close(fd);
+            throw std::runtime_error("read file failed: " + p.string());
+        }
+        off += static_cast<size_t>(r);
+    }
+    ::close(fd);
+    return buf;
+#else
     std::ifstream ifs(p, std::ios::binary);
     if (!ifs) throw std::runtime_error("open file failed: " + p.string());
     ifs.seekg(0, std::ios::end);
@@ -30,40 +83,147 @@ static std::vector<uint8_t> read_file_all(const std::filesystem::path& p) {
     if (n > 0) ifs.read(reinterpret_cast<char*>(buf.data()), n);
     if (!ifs) throw std::runtime_error("read file failed: " + p.string());
     return buf;
+#endif
 }
 
-static void write_file_all(const std::filesystem::path& p, const std::vector<uint8_t>& buf) {
-    std::filesystem::create_directories(p.parent_path());
+// 已确保存在的父目录缓存：同一目录下的成千上万个条目只 mkdir 一次，
+// 而不是每个文件都重走一遍 create_directories（即使 EEXIST 也要逐级遍历）
+struct DirCache {
+    std::unordered_set<std::string> seen;
+    std::mutex m; // 并行解包路径下也可安全共享
+
+    void ensure(const std::filesystem::path& parent) {
+        // 锁覆盖整个"查缓存 + mkdir + 记缓存"：目录创建成功之后才进 seen，
+        // 否则并行的兄弟条目可能在目录落地前就命中缓存去开文件
+        std::lock_guard<std::mutex> lk(m);
+        if (seen.count(parent.native())) return;
+        std::filesystem::create_directories(parent);
+        seen.insert(parent.native());
+    }
+};
+
+static void write_file_all(const std::filesystem::path& p, const uint8_t* data, size_t n,
+                           DirCache* dirs = nullptr) {
+    if (dirs) dirs->ensure(p.parent_path());
+    else std::filesystem::create_directories(p.parent_path());
+
     std::ofstream ofs(p, std::ios::binary);
     if (!ofs) throw std::runtime_error("write file failed: " + p.string());
-    if (!buf.empty()) ofs.write(reinterpret_cast<const char*>(buf.data()),
-                                static_cast<std::streamsize>(buf.size()));
+    if (n > 0) ofs.write(reinterpret_cast<const char*>(data),
+                         static_cast<std::streamsize>(n));
+}
+
+static void write_file_all(const std::filesystem::path& p, const std::vector<uint8_t>& buf,
+                           DirCache* dirs = nullptr) {
+    write_file_all(p, buf.data(), buf.size(), dirs);
+}
+
+// 把文件内容按块搬进输出流，返回拷贝的字节数；
+// 整个过程只占一块复用的 chunk 缓冲，payload 不整体驻留内存
+static uint64_t copy_file_into_stream(const std::filesystem::path& p, std::ostream& os,
+                                      std::vector<uint8_t>& chunk) {
+    std::ifstream ifs(p, std::ios::binary);
+    if (!ifs) throw std::runtime_error("open file failed: " + p.string());
+
+    uint64_t total = 0;
+    while (ifs) {
+        ifs.read(reinterpret_cast<char*>(chunk.data()),
+                 static_cast<std::streamsize>(chunk.size()));
+        std::streamsize got = ifs.gcount();
+        if (got <= 0) break;
+        os.write(reinterpret_cast<const char*>(chunk.data()), got);
+        total += static_cast<uint64_t>(got);
+    }
+    if (ifs.bad()) throw std::runtime_error("read file failed: " + p.string());
+    return total;
 }
 
-static std::string to_rel_generic(const std::filesystem::path& base,
-                                  const std::filesystem::path& p) {
-    auto rel = std::filesystem::relative(p, base);
-    return rel.generic_string(); // 强制用 /
+// 包内 relPath 固定用 '/'，POSIX 上直接拼 native 字符串即可，
+// 不必让 std::filesystem::path 再把字符串拆解成组件重新拼一遍
+static std::filesystem::path join_rel(const std::filesystem::path& base, const std::string& rel) {
+#ifndef _WIN32
+    std::string s;
+    s.reserve(base.native().size() + 1 + rel.size());
+    s += base.native();
+    s += '/';
+    s += rel;
+    return std::filesystem::path(std::move(s));
+#else
+    return base / std::filesystem::path(rel);
+#endif
 }
 
-static std::vector<uint8_t> apply_compress(const std::vector<uint8_t>& in, CompressAlg alg) {
-    if (alg == CompressAlg::RLE) return rle_compress(in);
-    return in;
+// 遍历产出的路径一定以 repoDir 为前缀：相对路径直接按前缀切字符串，
+// 不走 std::filesystem::relative（它会逐级 stat 做规范化）
+static std::string slice_rel_generic(const std::string& absNative, size_t basePrefixLen) {
+#ifndef _WIN32
+    return absNative.substr(basePrefixLen);
+#else
+    return std::filesystem::path(absNative.substr(basePrefixLen)).generic_string();
+#endif
 }
-static std::vector<uint8_t> apply_decompress(const std::vector<uint8_t>& in, CompressAlg alg) {
-    if (alg == CompressAlg::RLE) return rle_decompress(in);
-    return in;
+
+// 压缩 + 加密融合：压缩输出的缓冲直接原地加密，
+// 两个阶段之间不再有一次全量拷贝和一遍额外的内存带宽
+static std::vector<uint8_t> pack_payload(std::vector<uint8_t>&& raw, const Options& opt,
+                                         const std::vector<uint8_t>& salt,
+                                         const Rc4KeySchedule* rc4 = nullptr) {
+    std::vector<uint8_t> buf =
+        (opt.compressAlg == CompressAlg::RLE) ? rle_compress(raw) : std::move(raw);
+
+    if (opt.encryptAlg == EncryptAlg::XOR) {
+        xor_crypt_inplace(buf, opt.password, salt);
+    } else if (opt.encryptAlg == EncryptAlg::RC4) {
+        // 同一个包 password+salt 固定：调度预计算一次，逐 payload 复用
+        if (rc4) rc4_crypt_inplace(buf, *rc4);
+        else rc4_crypt_inplace(buf, opt.password, salt);
+    }
+    return buf;
 }
-static std::vector<uint8_t> apply_encrypt(const std::vector<uint8_t>& in, EncryptAlg alg,
-                                          const std::string& pw, const std::vector<uint8_t>& salt) {
-    if (alg == EncryptAlg::XOR) return xor_crypt(in, pw, salt);
-    if (alg == EncryptAlg::RC4) return rc4_crypt(in, pw, salt);
-    return in;
+
+// pack_payload 的逆：解密原地做在传入缓冲上，解压仅 RLE 时发生，
+// 两步融合在同一缓冲上推进——None/None 一路 move 到底，全程零整块拷贝
+static std::vector<uint8_t> unpack_payload(std::vector<uint8_t>&& stored,
+                                           CompressAlg compAlg, EncryptAlg encAlg,
+                                           const std::string& pw,
+                                           const std::vector<uint8_t>& salt,
+                                           const Rc4KeySchedule* rc4 = nullptr) {
+    if (encAlg == EncryptAlg::XOR) {
+        xor_crypt_inplace(stored, pw, salt);
+    } else if (encAlg == EncryptAlg::RC4) {
+        if (rc4) rc4_crypt_inplace(stored, *rc4);
+        else rc4_crypt_inplace(stored, pw, salt);
+    }
+    if (compAlg == CompressAlg::RLE) return rle_decompress(stored);
+    return std::move(stored);
 }
-static std::vector<uint8_t> apply_decrypt(const std::vector<uint8_t>& in, EncryptAlg alg,
-                                          const std::string& pw, const std::vector<uint8_t>& salt) {
-    // XOR/RC4 都是对称加密：同一个函数
-    return apply_encrypt(in, alg, pw, salt);
+
+// 把 n 个任务交给异步流水线：produce(i) 在工作线程上并行执行，
+// consume(i, 结果) 在调用线程上严格按 0..n-1 的顺序执行。
+// 在飞任务数以 2×工作线程数为上限，避免结果无界堆积
+template <typename ProduceFn, typename ConsumeFn>
+static void pipeline_ordered(size_t n, ProduceFn produce, ConsumeFn consume) {
+    unsigned workers = std::thread::hardware_concurrency();
+    if (workers == 0) workers = 1;
+    if (workers > 8) workers = 8;
+
+    if (workers <= 1 || n < 2) {
+        for (size_t i = 0; i < n; ++i) consume(i, produce(i));
+        return;
+    }
+
+    const size_t window = static_cast<size_t>(workers) * 2;
+    std::deque<std::future<decltype(produce(size_t{0}))>> pending;
+    size_t submitted = 0;
+
+    for (size_t i = 0; i < n; ++i) {
+        while (pending.size() < window && submitted < n) {
+            pending.emplace_back(std::async(std::launch::async, produce, submitted));
+            ++submitted;
+        }
+        consume(i, pending.front().get());
+        pending.pop_front();
+    }
 }
 
 // 文件头： "SEXP01"(6) + ver(u8) + pack(u8) + comp(u8) + enc(u8) + saltLen(u32) + saltBytes
@@ -80,37 +240,55 @@ bool export_repo_to_package(const std::filesystem::path& repoDir,
 
     auto salt = (opt.encryptAlg == EncryptAlg::None) ? std::vector<uint8_t>{} : gen_salt(16);
 
-    // 收集 repoDir 下所有普通文件（包含 index.txt / data/...）
-    std::vector<Entry> entries;
-    for (auto& it : std::filesystem::recursive_directory_iterator(repoDir)) {
-        if (!it.is_regular_file()) continue;
-
-        auto abs = it.path();
+    // RC4 密钥调度整包只做一次（password+salt 固定），各 payload 复用
+    std::optional<Rc4KeySchedule> rc4Ks;
+    if (opt.encryptAlg == EncryptAlg::RC4) rc4Ks = rc4_prepare(opt.password, salt);
+    const Rc4KeySchedule* rc4 = rc4Ks ? &*rc4Ks : nullptr;
+
+    // 自包含检查预先做一次：包文件不在 repoDir 下时整个检查直接免掉，
+    // 在其下时比较预先算好的相对路径字符串，不再每个文件两次 stat
+    std::string pkgRelInRepo;
+    {
+        auto repoAbs = std::filesystem::absolute(repoDir).lexically_normal();
+        auto pkgAbs = std::filesystem::absolute(packageFile).lexically_normal();
+        auto rel = pkgAbs.lexically_relative(repoAbs);
+        if (!rel.empty() && *rel.begin() != "..")
+            pkgRelInRepo = rel.generic_string();
+    }
 
-        // 避免把输出包自己又打进去（如果你把包输出到 repoDir 里）
-        // ⚠️ 注意：std::filesystem::equivalent 要求两个路径都存在，否则会抛异常
-        try {
-            if (std::filesystem::exists(packageFile) && std::filesystem::equivalent(abs, packageFile)) {
-                continue;
-            }
-        } catch (...) {
-            // 忽略等价性检查错误（比如 packageFile 尚未创建时）
-        }
+    // 相对路径按前缀切：遍历产出的绝对路径都带 repoDir 前缀
+    const std::string& baseNative = repoDir.native();
+    size_t basePrefixLen = baseNative.size();
+    if (!baseNative.empty() && baseNative.back() != std::filesystem::path::preferred_separator)
+        ++basePrefixLen;
 
-        auto raw = read_file_all(abs);
+    // 先只收集 repoDir 下所有普通文件的路径和包内相对路径（轻量），
+    // payload 逐个读取、处理，不整树驻留内存
+    std::vector<std::filesystem::path> files;
+    std::vector<std::string> rels;
+    for (auto& it : std::filesystem::recursive_directory_iterator(repoDir)) {
+        // 常见情况（普通文件/目录）用迭代器缓存的 symlink_status 判断即可，
+        // 只有符号链接才额外 stat 一次目标，维持"跟随链接"的原语义
+        auto st = it.symlink_status();
+        bool isRegular = std::filesystem::is_regular_file(st) ||
+                         (std::filesystem::is_symlink(st) && it.is_regular_file());
+        if (!isRegular) continue;
 
-        Entry e;
-        e.relPath = to_rel_generic(repoDir, abs);
-        e.originalSize = static_cast<uint64_t>(raw.size());
+        std::string rel = slice_rel_generic(it.path().native(), basePrefixLen);
 
-        auto c = apply_compress(raw, opt.compressAlg);
-        auto enc = apply_encrypt(c, opt.encryptAlg, opt.password, salt);
+        // 避免把输出包自己又打进去（如果你把包输出到 repoDir 里）
+        if (!pkgRelInRepo.empty() && rel == pkgRelInRepo) continue;
 
-        e.payload = std::move(enc);
-        entries.push_back(std::move(e));
+        files.push_back(it.path());
+        rels.push_back(std::move(rel));
     }
 
-    std::ofstream os(packageFile, std::ios::binary);
+    // 给包文件流配一个 1MiB 的大缓冲（须在 open 之前设置），
+    // 把大量小段写聚成少量底层 write 系统调用
+    std::vector<char> iobuf(1 << 20);
+    std::ofstream os;
+    os.rdbuf()->pubsetbuf(iobuf.data(), static_cast<std::streamsize>(iobuf.size()));
+    os.open(packageFile, std::ios::binary);
     if (!os) throw std::runtime_error("cannot create package file: " + packageFile.string());
 
     // 写头
@@ -123,24 +301,78 @@ bool export_repo_to_package(const std::filesystem::path& repoDir,
     write_bytes(os, salt);
 
     // 写包体
-    if (opt.packAlg == PackAlg::HeaderPerFile) {
-        pack_header_write(os, entries);
+    // 读取 + 压缩 + 加密由工作线程并行完成，写出端按原顺序消费
+    auto produceEntry = [&](size_t i) {
+        auto raw = read_file_all(files[i]);
+
+        Entry e;
+        e.relPath = rels[i];
+        e.originalSize = static_cast<uint64_t>(raw.size());
+        e.payload = pack_payload(std::move(raw), opt, salt, rc4);
+        return e;
+    };
+
+    // 直存模式标志算一次：不压缩不加密时 payload 就是文件原始字节
+    const bool passthrough =
+        (opt.compressAlg == CompressAlg::None && opt.encryptAlg == EncryptAlg::None);
+
+    if (opt.packAlg == PackAlg::HeaderPerFile && passthrough) {
+        // 直存：跳过 pack_payload/流水线，按块把文件内容搬进包文件，
+        // origSize == storedSize，单文件也不整体驻留内存
+        pack_header_write_count(os, static_cast<uint32_t>(files.size()));
+        std::vector<uint8_t> chunk(1 << 20);
+        std::string headScratch;
+        for (size_t i = 0; i < files.size(); ++i) {
+            uint64_t n = std::filesystem::file_size(files[i]);
+            pack_header_write_entry_head(os, rels[i], n, n, headScratch);
+            uint64_t copied = copy_file_into_stream(files[i], os, chunk);
+            if (copied != n)
+                throw std::runtime_error("file changed during export: " + files[i].string());
+        }
+    } else if (opt.packAlg == PackAlg::HeaderPerFile) {
+        // 流式：entry 产出即写出，payload 随即释放
+        pack_header_write_count(os, static_cast<uint32_t>(files.size()));
+        std::string headScratch;
+        pipeline_ordered(files.size(), produceEntry, [&](size_t, Entry e) {
+            pack_header_write_entry(os, e, headScratch);
+        });
+    } else if (passthrough) {
+        // TOC 直通模式：不压缩不加密时 payload 就是文件原始字节，
+        // 直接按块从磁盘搬进包文件，记下 offset/size 即可
+        std::vector<TocItem> toc;
+        toc.reserve(files.size());
+
+        std::vector<uint8_t> chunk(1 << 20);
+        for (size_t i = 0; i < files.size(); ++i) {
+            TocItem t;
+            t.relPath = std::move(rels[i]);
+            t.offset = static_cast<uint64_t>(os.tellp());
+
+            uint64_t n = copy_file_into_stream(files[i], os, chunk);
+            t.originalSize = n;
+            t.storedSize = n;
+            toc.push_back(std::move(t));
+        }
+
+        pack_toc_write_index(os, toc);
     } else {
+        // TOC 变换模式：blob 产出即写出并当场记下 offset/storedSize，
+        // 只有轻量的 TOC 元数据驻留内存，峰值不再是全部加密后字节之和
         std::vector<TocItem> toc;
-        std::vector<std::vector<uint8_t>> blobs;
-        toc.reserve(entries.size());
-        blobs.reserve(entries.size());
+        toc.reserve(files.size());
 
-        for (auto& e : entries) {
+        pipeline_ordered(files.size(), produceEntry, [&](size_t, Entry e) {
             TocItem t;
-            t.relPath = e.relPath;
+            t.relPath = std::move(e.relPath);
             t.originalSize = e.originalSize;
+            t.offset = static_cast<uint64_t>(os.tellp());
+            t.storedSize = static_cast<uint64_t>(e.payload.size());
 
+            write_bytes(os, e.payload);
             toc.push_back(std::move(t));
-            blobs.push_back(std::move(e.payload));
-        }
+        });
 
-        pack_toc_write(os, toc, blobs);
+        pack_toc_write_index(os, toc);
     }
 
     return true;
@@ -149,7 +381,11 @@ bool export_repo_to_package(const std::filesystem::path& repoDir,
 bool import_package_to_repo(const std::filesystem::path& packageFile,
                             const std::filesystem::path& repoDir,
                             const std::string& password) {
-    std::ifstream is(packageFile, std::ios::binary);
+    // 与导出对称：输入流同样配 1MiB 缓冲，减少底层 read 次数
+    std::vector<char> iobuf(1 << 20);
+    std::ifstream is;
+    is.rdbuf()->pubsetbuf(iobuf.data(), static_cast<std::streamsize>(iobuf.size()));
+    is.open(packageFile, std::ios::binary);
     if (!is) throw std::runtime_error("cannot open package file: " + packageFile.string());
 
     // 读 magic
@@ -161,9 +397,14 @@ bool import_package_to_repo(const std::filesystem::path& packageFile,
     auto ver = read_u8(is);
     (void)ver;
 
-    PackAlg packAlg = static_cast<PackAlg>(read_u8(is));
-    CompressAlg compAlg = static_cast<CompressAlg>(read_u8(is));
-    EncryptAlg encAlg = static_cast<EncryptAlg>(read_u8(is));
+    PackAlg packAlg{};
+    CompressAlg compAlg{};
+    EncryptAlg encAlg{};
+    if (!packFromCode(read_u8(is), packAlg) ||
+        !compressFromCode(read_u8(is), compAlg) ||
+        !encryptFromCode(read_u8(is), encAlg)) {
+        throw std::runtime_error("unknown algorithm code in package header");
+    }
 
     uint32_t saltLen = read_le<uint32_t>(is);
     auto salt = read_bytes(is, saltLen);
@@ -171,29 +412,295 @@ bool import_package_to_repo(const std::filesystem::path& packageFile,
     if (encAlg != EncryptAlg::None && password.empty())
         throw std::runtime_error("package is encrypted but password is empty");
 
+    // RC4 密钥调度整包只做一次，解密各 payload 时复用
+    std::optional<Rc4KeySchedule> rc4Ks;
+    if (encAlg == EncryptAlg::RC4) rc4Ks = rc4_prepare(password, salt);
+    const Rc4KeySchedule* rc4 = rc4Ks ? &*rc4Ks : nullptr;
+
     std::filesystem::create_directories(repoDir);
+    DirCache dirCache;
 
     if (packAlg == PackAlg::HeaderPerFile) {
+#ifndef _WIN32
+        // 整包 mmap：entry 头直接在映射上解析，payload 就地切片——
+        // 直通时零中间拷贝，变换时也只在处理到该条目时才拷一次，
+        // 不再提前把所有 payload 复制进内存
+        {
+            int fd = ::open(packageFile.c_str(), O_RDONLY);
+            if (fd >= 0) {
+                const uint8_t* map = nullptr;
+                size_t mapLen = 0;
+                struct stat st{};
+                if (fstat(fd, &st) == 0 && st.st_size > 0) {
+                    void* m = ::mmap(nullptr, static_cast<size_t>(st.st_size),
+                                     PROT_READ, MAP_PRIVATE, fd, 0);
+                    if (m != MAP_FAILED) {
+                        map = static_cast<const uint8_t*>(m);
+                        mapLen = static_cast<size_t>(st.st_size);
+                    }
+                }
+                if (map) {
+                    struct HdrItem {
+                        std::string relPath;
+                        size_t offset = 0;
+                        size_t storedSize = 0;
+                    };
+                    std::vector<HdrItem> items;
+
+                    // 文件头已经由流读过：从当前流位置接着在映射上解析。
+                    // 长度字段都来自文件本身：边界检查写成减法形式，
+                    // 防止 pos + n 回绕后放行越界读（pos <= mapLen 是循环不变量）
+                    size_t pos = static_cast<size_t>(is.tellg());
+                    auto need = [&](size_t n) {
+                        if (n > mapLen - pos)
+                            throw std::runtime_error("package truncated");
+                    };
+                    try {
+                        if (pos > mapLen)
+                            throw std::runtime_error("package truncated");
+                        need(4);
+                        uint32_t count = parse_le<uint32_t>(map + pos);
+                        pos += 4;
+                        items.reserve(count);
+                        for (uint32_t k = 0; k < count; ++k) {
+                            need(4);
+                            uint32_t pathLen = parse_le<uint32_t>(map + pos);
+                            pos += 4;
+                            const size_t pl = static_cast<size_t>(pathLen);
+                            need(pl + 16);
+                            HdrItem it;
+                            it.relPath.assign(reinterpret_cast<const char*>(map + pos), pl);
+                            pos += pl + 8; // 跳过 originalSize
+                            it.storedSize = static_cast<size_t>(parse_le<uint64_t>(map + pos));
+                            pos += 8;
+                            need(it.storedSize);
+                            it.offset = pos;
+                            pos += it.storedSize;
+                            items.push_back(std::move(it));
+                        }
+                    } catch (...) {
+                        ::munmap(const_cast<uint8_t*>(map), mapLen);
+                        ::close(fd);
+                        throw;
+                    }
+
+                    const bool passthrough =
+                        (compAlg == CompressAlg::None && encAlg == EncryptAlg::None);
+
+                    auto processItem = [&](const HdrItem& it) {
+                        const uint8_t* src = map + it.offset;
+                        if (passthrough) {
+                            // 直通：从映射直接写出，零中间拷贝
+                            write_file_all(join_rel(repoDir, it.relPath), src,
+                                           it.storedSize, &dirCache);
+                            return;
+                        }
+                        std::vector<uint8_t> blob(src, src + it.storedSize);
+                        auto raw = unpack_payload(std::move(blob), compAlg, encAlg,
+                                                  password, salt, rc4);
+                        write_file_all(join_rel(repoDir, it.relPath), raw, &dirCache);
+                    };
+
+                    unsigned workers = std::thread::hardware_concurrency();
+                    if (workers == 0) workers = 1;
+                    if (workers > 8) workers = 8;
+                    if (workers > items.size()) workers = static_cast<unsigned>(items.size());
+
+                    if (workers <= 1) {
+                        for (const auto& it : items) processItem(it);
+                    } else {
+                        std::atomic<size_t> next{0};
+                        std::atomic<bool> failed{false};
+                        std::mutex errMutex;
+                        std::string firstError;
+
+                        auto work = [&]() {
+                            size_t i;
+                            while (!failed.load(std::memory_order_relaxed) &&
+                                   (i = next.fetch_add(1)) < items.size()) {
+                                try {
+                                    processItem(items[i]);
+                                } catch (const std::exception& ex) {
+                                    std::lock_guard<std::mutex> lk(errMutex);
+                                    if (!failed.exchange(true)) firstError = ex.what();
+                                }
+                            }
+                        };
+
+                        std::vector<std::thread> threads;
+                        threads.reserve(workers);
+                        for (unsigned t = 0; t < workers; ++t) threads.emplace_back(work);
+                        for (auto& t : threads) t.join();
+
+                        if (failed.load()) {
+                            ::munmap(const_cast<uint8_t*>(map), mapLen);
+                            ::close(fd);
+                            throw std::runtime_error(firstError);
+                        }
+                    }
+
+                    ::munmap(const_cast<uint8_t*>(map), mapLen);
+                    ::close(fd);
+                    return true;
+                }
+                ::close(fd);
+            }
+        }
+#endif
+
+        // 映射不可用时回退：沿用输入流一次读入全部条目
         auto entries = pack_header_read(is);
-        for (auto& e : entries) {
-            auto dec = apply_decrypt(e.payload, encAlg, password, salt);
-            auto raw = apply_decompress(dec, compAlg);
 
-            auto outPath = repoDir / std::filesystem::path(e.relPath);
-            write_file_all(outPath, raw);
+        // 解密/解压/落盘各条目互相独立：交给独立的工作线程池并发处理，
+        // 不再在读包的线程上串行消化所有 payload
+        auto processEntry = [&](Entry& e) {
+            auto raw = unpack_payload(std::move(e.payload), compAlg, encAlg,
+                                      password, salt, rc4);
+
+            write_file_all(join_rel(repoDir, e.relPath), raw, &dirCache);
+        };
+
+        unsigned workers = std::thread::hardware_concurrency();
+        if (workers == 0) workers = 1;
+        if (workers > 8) workers = 8;
+        if (workers > entries.size()) workers = static_cast<unsigned>(entries.size());
+
+        if (workers <= 1) {
+            for (auto& e : entries) processEntry(e);
+        } else {
+            std::atomic<size_t> next{0};
+            std::atomic<bool> failed{false};
+            std::mutex errMutex;
+            std::string firstError;
+
+            auto work = [&]() {
+                size_t i;
+                while (!failed.load(std::memory_order_relaxed) &&
+                       (i = next.fetch_add(1)) < entries.size()) {
+                    try {
+                        processEntry(entries[i]);
+                    } catch (const std::exception& ex) {
+                        std::lock_guard<std::mutex> lk(errMutex);
+                        if (!failed.exchange(true)) firstError = ex.what();
+                    }
+                }
+            };
+
+            std::vector<std::thread> threads;
+            threads.reserve(workers);
+            for (unsigned t = 0; t < workers; ++t) threads.emplace_back(work);
+            for (auto& t : threads) t.join();
+
+            if (failed.load()) throw std::runtime_error(firstError);
         }
     } else {
+        // TOC 模式：先只读目录块，blob 的位置/大小都已知，
+        // 各文件的 读取→解密→解压→落盘 完全独立，可以并行展开
         std::vector<TocItem> toc;
-        std::vector<std::vector<uint8_t>> blobs;
-
-        pack_toc_read(is, toc, blobs);
+        pack_toc_read_index(is, toc);
+
+        auto extractOne = [&](const TocItem& item, std::vector<uint8_t>&& blob) {
+            auto raw = unpack_payload(std::move(blob), compAlg, encAlg,
+                                      password, salt, rc4);
+
+            write_file_all(join_rel(repoDir, item.relPath), raw, &dirCache);
+        };
+
+#ifndef _WIN32
+        unsigned workers = std::thread::hardware_concurrency();
+        if (workers == 0) workers = 1;
+        if (workers > 8) workers = 8;
+        if (workers > toc.size()) workers = static_cast<unsigned>(toc.size());
+
+        if (workers > 1) {
+            int fd = ::open(packageFile.c_str(), O_RDONLY);
+            if (fd < 0) throw std::runtime_error("cannot open package file: " + packageFile.string());
+
+            // 整包 mmap 一次：blob 直接从页缓存切片，不直通时也只剩
+            // 一次 memcpy 进工作缓冲；映射失败则回退到 pread
+            const uint8_t* map = nullptr;
+            size_t mapLen = 0;
+            struct stat st{};
+            if (fstat(fd, &st) == 0 && st.st_size > 0) {
+                void* m = ::mmap(nullptr, static_cast<size_t>(st.st_size),
+                                 PROT_READ, MAP_PRIVATE, fd, 0);
+                if (m != MAP_FAILED) {
+                    map = static_cast<const uint8_t*>(m);
+                    mapLen = static_cast<size_t>(st.st_size);
+                }
+            }
 
-        for (size_t i = 0; i < toc.size(); ++i) {
-            auto dec = apply_decrypt(blobs[i], encAlg, password, salt);
-            auto raw = apply_decompress(dec, compAlg);
+            const bool passthrough =
+                (compAlg == CompressAlg::None && encAlg == EncryptAlg::None);
+
+            // LPT 调度：按 storedSize 降序领取任务，免得最大的 blob
+            // 排在末尾拖长收尾；各文件落盘互相独立，处理顺序无关紧要
+            std::vector<size_t> order(toc.size());
+            for (size_t i = 0; i < order.size(); ++i) order[i] = i;
+            std::sort(order.begin(), order.end(), [&](size_t a, size_t b) {
+                return toc[a].storedSize > toc[b].storedSize;
+            });
+
+            std::atomic<size_t> next{0};
+            std::atomic<bool> failed{false};
+            std::mutex errMutex;
+            std::string firstError;
+
+            auto work = [&]() {
+                size_t i;
+                while (!failed.load(std::memory_order_relaxed) &&
+                       (i = next.fetch_add(1)) < toc.size()) {
+                    try {
+                        const auto& item = toc[order[i]];
+                        size_t sz = static_cast<size_t>(item.storedSize);
+
+                        if (map) {
+                            // offset 和 sz 都来自文件，相加可能回绕：用减法形式判界
+                            if (item.offset > mapLen || sz > mapLen - item.offset)
+                                throw std::runtime_error("blob out of range: " + item.relPath);
+                            const uint8_t* src = map + item.offset;
+                            if (passthrough) {
+                                // 直通：从映射直接写出，零中间拷贝
+                                write_file_all(join_rel(repoDir, item.relPath), src, sz, &dirCache);
+                            } else {
+                                extractOne(item, std::vector<uint8_t>(src, src + sz));
+                            }
+                            continue;
+                        }
+
+                        // 无映射回退：每个线程用 pread 独立定位读取
+                        std::vector<uint8_t> blob(sz);
+                        size_t off = 0;
+                        while (off < blob.size()) {
+                            ssize_t r = ::pread(fd, blob.data() + off, blob.size() - off,
+                                                static_cast<off_t>(item.offset + off));
+                            if (r <= 0) throw std::runtime_error("read blob failed: " + item.relPath);
+                            off += static_cast<size_t>(r);
+                        }
+                        extractOne(item, std::move(blob));
+                    } catch (const std::exception& ex) {
+                        std::lock_guard<std::mutex> lk(errMutex);
+                        if (!failed.exchange(true)) firstError = ex.what();
+                    }
+                }
+            };
+
+            std::vector<std::thread> threads;
+            threads.reserve(workers);
+            for (unsigned t = 0; t < workers; ++t) threads.emplace_back(work);
+            for (auto& t : threads) t.join();
+            if (map) ::munmap(const_cast<uint8_t*>(map), mapLen);
+            ::close(fd);
+
+            if (failed.load()) throw std::runtime_error(firstError);
+            return true;
+        }
+#endif
 
-            auto outPath = repoDir / std::filesystem::path(toc[i].relPath);
-            write_file_all(outPath, raw);
+        // 单核/非 POSIX 回退：沿用输入流按 offset 逐个读取
+        for (const auto& item : toc) {
+            is.seekg(static_cast<std::streamoff>(item.offset), std::ios::beg);
+            extractOne(item, read_bytes(is, static_cast<size_t>(item.storedSize)));
         }
     }
 